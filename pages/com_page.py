@@ -4,7 +4,8 @@ Displays all 7 COM visualizations with metrics dashboard.
 """
 import streamlit as st
 import os
-from utils.data_loader import load_com_data, load_pose_data, load_metadata
+from utils.data_loader import load_com_data, load_pose_soa, load_metadata, get_mtime
+from utils.figure_cache import cached_plot
 
 # Constants
 VIDEO_PATH = "data/video_preview_h264.mp4"
@@ -13,45 +14,161 @@ JSON_PATH = "data/analysis_output.json"
 def render_metrics_dashboard(com_data, metadata):
     """Render metrics dashboard with key COM statistics."""
     fps = metadata.get("fps", 24.0)
+    get = com_data.get
+    
+    stance_frame = get("stance_frame", 0)
+    impact_frame = get("impact_frame", 0)
+    
+    # (label, value, st.metric kwargs), formatted once before any widget call
+    metrics = (
+        ("COM Shift", f"{get('com_shift_norm', 0.0):.3f}",
+         dict(delta=f"{get('com_shift_percent_width', 0.0):.1f}% of width",
+              help="Lateral shift of center of mass from stance to impact")),
+        ("Stance Frame", f"{stance_frame}",
+         dict(delta=f"{stance_frame/fps:.2f}s",
+              help="Frame where bowler is in stable stance position")),
+        ("Impact Frame", f"{impact_frame}",
+         dict(delta=f"{impact_frame/fps:.2f}s",
+              help="Frame with maximum hip movement (ball release)")),
+        ("Stance Width", f"{get('stance_width_norm', 0.0):.3f}",
+         dict(help="Distance between ankles at stance (normalized)")),
+    )
+    
+    for col, (label, value, kwargs) in zip(st.columns(len(metrics)), metrics):
+        with col:
+            st.metric(label, value, **kwargs)
+
+@st.fragment
+def render_video_section(com_data, metadata, mtime):
+    """Render the overlay video as a fragment, isolated from the rest of the page."""
+    st.markdown("### Video with COM Overlay")
     
-    stance_frame = com_data.get("stance_frame", 0)
-    impact_frame = com_data.get("impact_frame", 0)
-    com_shift_norm = com_data.get("com_shift_norm", 0.0)
-    com_shift_percent = com_data.get("com_shift_percent_width", 0.0)
-    stance_width = com_data.get("stance_width_norm", 0.0)
+    with st.spinner("Processing video with COM annotations..."):
+        from utils.video_processor import process_video_with_com_overlay, compute_sample_stride, compute_preview_scale
+        from utils.video_cache import cached_video, deferred_video, VIDEO_EXTENSIONS
+        
+        # Rendered once per (video, analysis data) version and reused across reruns.
+        # The player gets a <=480p preview; full resolution is encoded only on download.
+        sample_stride = compute_sample_stride(VIDEO_PATH, metadata)
+        video = cached_video(
+            process_video_with_com_overlay, VIDEO_PATH, (JSON_PATH, mtime),
+            load_pose_soa(JSON_PATH, mtime), com_data, metadata,
+            sample_stride=sample_stride,
+            render_scale=compute_preview_scale(VIDEO_PATH)
+        )
+        
+        if video:
+            video_bytes, video_format = video
+            st.video(video_bytes, format=video_format)
+            st.download_button(
+                "⬇️ Download full resolution",
+                data=deferred_video(
+                    process_video_with_com_overlay, VIDEO_PATH, (JSON_PATH, mtime),
+                    load_pose_soa(JSON_PATH, mtime), com_data, metadata,
+                    sample_stride=sample_stride
+                ),
+                file_name=f"com_overlay{VIDEO_EXTENSIONS.get(video_format, '.mp4')}",
+                mime=video_format,
+                on_click="ignore"
+            )
+        else:
+            st.error("Failed to process video")
+
+@st.fragment
+def render_analysis_views(com_data, metadata, mtime):
+    """
+    Render the selected analysis view; switching views reruns only this fragment.
+    
+    Pose data is the bulk of the file, so it is only loaded for the views that
+    chart it (float32, since they plot frame-to-frame hip movement).
+    """
+    st.markdown("### Detailed Analysis")
+    tab_labels = [
+        "🧭 Overview",
+        "🗺️ COM Trajectory",
+        "📊 Movement Scores",
+        "🔍 COM Components",
+        "🔥 Heatmap",
+        "⚡ Velocity Analysis",
+        "🔄 Phase Diagram",
+        "📈 Stability Index",
+        "💎 Movement Efficiency",
+        "🌐 3D Trajectory",
+        "🏆 Benchmarks"
+    ]
+    active_tab = st.radio(
+        "Analysis view",
+        tab_labels,
+        horizontal=True,
+        key="com_active_tab",
+        label_visibility="collapsed"
+    )
+    
+    if active_tab == "🧭 Overview":
+        from visualizations.com_viz import plot_com_overview
+        fig = cached_plot(plot_com_overview, (JSON_PATH, mtime), load_pose_soa(JSON_PATH, mtime, "float32"), com_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Trajectory, movement scores, components and density in one view - pick a chart above for full detail")
     
-    col1, col2, col3, col4 = st.columns(4)
+    elif active_tab == "🗺️ COM Trajectory":
+        from visualizations.com_viz import plot_com_trajectory
+        fig = cached_plot(plot_com_trajectory, (JSON_PATH, mtime), com_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Shows lateral COM movement across delivery phases with stance and impact markers")
     
-    with col1:
-        st.metric(
-            "COM Shift",
-            f"{com_shift_norm:.3f}",
-            delta=f"{com_shift_percent:.1f}% of width",
-            help="Lateral shift of center of mass from stance to impact"
-        )
+    elif active_tab == "📊 Movement Scores":
+        from visualizations.com_viz import plot_movement_scores
+        fig = cached_plot(plot_movement_scores, (JSON_PATH, mtime), load_pose_soa(JSON_PATH, mtime, "float32"), com_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Hip movement scores help validate stance (minimum) and impact (maximum) frame detection")
     
-    with col2:
-        st.metric(
-            "Stance Frame",
-            f"{stance_frame}",
-            delta=f"{stance_frame/fps:.2f}s",
-            help="Frame where bowler is in stable stance position"
-        )
+    elif active_tab == "🔍 COM Components":
+        from visualizations.com_viz import plot_com_components
+        fig = cached_plot(plot_com_components, (JSON_PATH, mtime), load_pose_soa(JSON_PATH, mtime, "float32"), com_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("COM is calculated as 60% hip midpoint + 40% shoulder midpoint")
     
-    with col3:
-        st.metric(
-            "Impact Frame",
-            f"{impact_frame}",
-            delta=f"{impact_frame/fps:.2f}s",
-            help="Frame with maximum hip movement (ball release)"
-        )
+    elif active_tab == "🔥 Heatmap":
+        from visualizations.com_viz import create_heatmap
+        fig = cached_plot(create_heatmap, (JSON_PATH, mtime), com_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Density distribution showing where COM is concentrated during delivery")
     
-    with col4:
-        st.metric(
-            "Stance Width",
-            f"{stance_width:.3f}",
-            help="Distance between ankles at stance (normalized)"
-        )
+    elif active_tab == "⚡ Velocity Analysis":
+        from visualizations.com_viz_advanced import plot_com_velocity_analysis
+        fig = cached_plot(plot_com_velocity_analysis, (JSON_PATH, mtime), com_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Position, velocity, and acceleration analysis of COM movement")
+    
+    elif active_tab == "🔄 Phase Diagram":
+        from visualizations.com_viz_advanced import plot_com_phase_diagram
+        fig = cached_plot(plot_com_phase_diagram, (JSON_PATH, mtime), com_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Phase space diagram showing position vs velocity relationship")
+    
+    elif active_tab == "📈 Stability Index":
+        from visualizations.com_viz_advanced import plot_com_stability_index
+        fig = cached_plot(plot_com_stability_index, (JSON_PATH, mtime), com_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Rolling stability score over time - higher is more stable")
+    
+    elif active_tab == "💎 Movement Efficiency":
+        from visualizations.com_viz_advanced import plot_com_movement_efficiency
+        fig = cached_plot(plot_com_movement_efficiency, (JSON_PATH, mtime), com_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Efficiency of COM movement - direct path vs total path")
+    
+    elif active_tab == "🌐 3D Trajectory":
+        from visualizations.com_viz_advanced import plot_com_3d_trajectory
+        fig = cached_plot(plot_com_3d_trajectory, (JSON_PATH, mtime), com_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("3D visualization of COM trajectory with time dimension")
+    
+    elif active_tab == "🏆 Benchmarks":
+        from visualizations.com_viz_advanced import plot_com_benchmark_comparison
+        fig = cached_plot(plot_com_benchmark_comparison, (JSON_PATH, mtime), com_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Compare your lateral COM movement against benchmarks")
 
 def render():
     """Main render function for COM analysis page."""
@@ -68,9 +185,9 @@ def render():
         return
     
     # Load data
-    com_data = load_com_data(JSON_PATH)
-    pose_data = load_pose_data(JSON_PATH)
-    metadata = load_metadata(JSON_PATH)
+    mtime = get_mtime(JSON_PATH)
+    com_data = load_com_data(JSON_PATH, mtime)
+    metadata = load_metadata(JSON_PATH, mtime)
     
     if not com_data:
         st.warning("No COM analysis data found in JSON file")
@@ -113,124 +230,29 @@ def render():
     with col1:
         if assessment["strengths"]:
             st.markdown("**✅ Strengths:**")
-            for strength in assessment["strengths"]:
-                st.success(strength, icon="✅")
+            st.success("\n".join(f"- {strength}" for strength in assessment["strengths"]), icon="✅")
     
     with col2:
         if assessment["areas_for_improvement"]:
             st.markdown("**🎯 Areas for Improvement:**")
-            for area in assessment["areas_for_improvement"]:
-                st.warning(area, icon="🎯")
+            st.warning("\n".join(f"- {area}" for area in assessment["areas_for_improvement"]), icon="🎯")
     
     # Recommendations
     if assessment["recommendations"]:
         with st.expander("💡 **Coaching Recommendations**", expanded=True):
-            for i, rec in enumerate(assessment["recommendations"], 1):
-                st.markdown(f"{i}. {rec}")
+            st.markdown("\n".join(f"{i}. {rec}" for i, rec in enumerate(assessment["recommendations"], 1)))
     
     # Technical notes
     if assessment["technical_notes"]:
         with st.expander("📝 Technical Notes"):
-            for note in assessment["technical_notes"]:
-                st.markdown(f"- {note}")
+            st.markdown("\n".join(f"- {note}" for note in assessment["technical_notes"]))
     
     st.markdown("---")
     
     # Video Section with COM Overlay
-    st.markdown("### Video with COM Overlay")
-    
-    with st.spinner("Processing video with COM annotations..."):
-        from utils.video_processor import process_video_with_com_overlay
-        import tempfile
-        
-        # Use temp file that will be auto-deleted
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tmp:
-            output_path = tmp.name
-        
-        result = process_video_with_com_overlay(
-            VIDEO_PATH, pose_data, com_data, metadata, output_path
-        )
-        
-        if result:
-            st.video(result)
-            # Note: File will be cleaned up by OS temp directory cleanup
-        else:
-            st.error("Failed to process video")
+    render_video_section(com_data, metadata, mtime)
     
     st.markdown("---")
     
-    # Analysis Tabs
-    st.markdown("### Detailed Analysis")
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
-        "🗺️ COM Trajectory",
-        "📊 Movement Scores",
-        "🔍 COM Components",
-        "🔥 Heatmap",
-        "⚡ Velocity Analysis",
-        "🔄 Phase Diagram",
-        "📈 Stability Index",
-        "💎 Movement Efficiency",
-        "🌐 3D Trajectory",
-        "🏆 Benchmarks"
-    ])
-    
-    with tab1:
-        from visualizations.com_viz import plot_com_trajectory
-        fig = plot_com_trajectory(com_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Shows lateral COM movement across delivery phases with stance and impact markers")
-    
-    with tab2:
-        from visualizations.com_viz import plot_movement_scores
-        fig = plot_movement_scores(pose_data, com_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Hip movement scores help validate stance (minimum) and impact (maximum) frame detection")
-    
-    with tab3:
-        from visualizations.com_viz import plot_com_components
-        fig = plot_com_components(pose_data, com_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("COM is calculated as 60% hip midpoint + 40% shoulder midpoint")
-    
-    with tab4:
-        from visualizations.com_viz import create_heatmap
-        fig = create_heatmap(com_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Density distribution showing where COM is concentrated during delivery")
-    
-    with tab5:
-        from visualizations.com_viz_advanced import plot_com_velocity_analysis
-        fig = plot_com_velocity_analysis(com_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Position, velocity, and acceleration analysis of COM movement")
-    
-    with tab6:
-        from visualizations.com_viz_advanced import plot_com_phase_diagram
-        fig = plot_com_phase_diagram(com_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Phase space diagram showing position vs velocity relationship")
-    
-    with tab7:
-        from visualizations.com_viz_advanced import plot_com_stability_index
-        fig = plot_com_stability_index(com_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Rolling stability score over time - higher is more stable")
-    
-    with tab8:
-        from visualizations.com_viz_advanced import plot_com_movement_efficiency
-        fig = plot_com_movement_efficiency(com_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Efficiency of COM movement - direct path vs total path")
-    
-    with tab9:
-        from visualizations.com_viz_advanced import plot_com_3d_trajectory
-        fig = plot_com_3d_trajectory(com_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("3D visualization of COM trajectory with time dimension")
-    
-    with tab10:
-        from visualizations.com_viz_advanced import plot_com_benchmark_comparison
-        fig = plot_com_benchmark_comparison(com_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Compare your lateral COM movement against benchmarks")
-
+    # Analysis Tabs - only the selected view is built on each rerun
+    render_analysis_views(com_data, metadata, mtime)
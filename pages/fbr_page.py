@@ -3,7 +3,8 @@ FBR (Front-Back-Release) Analysis Page
 Displays foot plant biomechanics with COM descent and braking efficiency.
 """
 import streamlit as st
-from utils.data_loader import load_fbr_data, load_metadata
+from utils.data_loader import load_fbr_data, load_metadata, get_mtime
+from utils.figure_cache import cached_plot
 
 # Constants
 VIDEO_PATH = "data/video_preview_h264.mp4"
@@ -12,44 +13,165 @@ JSON_PATH = "data/analysis_output.json"
 def render_metrics_dashboard(fbr_data, metadata):
     """Render metrics dashboard with key FBR statistics."""
     fps = metadata.get("fps", 24.0)
+    get = fbr_data.get
+    
+    plant_frame = get("plant_frame", 0)
+    
+    # (label, value, st.metric kwargs), formatted once before any widget call
+    metrics = (
+        ("FBR Score", f"{get('fbr_score', 0.0):.4f}",
+         dict(delta="Lower is better", delta_color="inverse",
+              help="Braking efficiency - descent/deceleration ratio")),
+        ("Peak Deceleration", f"{get('peak_deceleration', 0.0):.4f}",
+         dict(help="Maximum braking force at foot plant")),
+        ("Max Descent", f"{get('max_vertical_descent', 0.0):.4f}",
+         dict(help="Maximum vertical COM drop after foot plant")),
+        ("Foot Plant Frame", f"{plant_frame}",
+         dict(delta=f"{plant_frame/fps:.2f}s",
+              help="Frame where front foot plants")),
+    )
+    
+    for col, (label, value, kwargs) in zip(st.columns(len(metrics)), metrics):
+        with col:
+            st.metric(label, value, **kwargs)
+
+@st.fragment
+def render_video_section(fbr_data, metadata, mtime):
+    """Render the overlay video as a fragment, isolated from the rest of the page."""
+    st.markdown("### Video with FBR Analysis")
     
-    fbr_score = fbr_data.get("fbr_score", 0.0)
-    peak_decel = fbr_data.get("peak_deceleration", 0.0)
-    max_descent = fbr_data.get("max_vertical_descent", 0.0)
-    plant_frame = fbr_data.get("plant_frame", 0)
+    with st.spinner("Processing video with FBR annotations..."):
+        from utils.fbr_video_processor import process_video_with_fbr
+        from utils.video_processor import compute_sample_stride, compute_preview_scale
+        from utils.video_cache import cached_video, deferred_video, VIDEO_EXTENSIONS
+        from utils.data_loader import load_pose_soa
+        
+        pose = load_pose_soa(JSON_PATH, mtime)
+        
+        # Rendered once per (video, analysis data) version and reused across reruns.
+        # The player gets a <=480p preview; full resolution is encoded only on download.
+        sample_stride = compute_sample_stride(VIDEO_PATH, metadata)
+        video = cached_video(
+            process_video_with_fbr, VIDEO_PATH, (JSON_PATH, mtime),
+            pose, fbr_data, metadata,
+            sample_stride=sample_stride,
+            render_scale=compute_preview_scale(VIDEO_PATH)
+        )
+        
+        if video:
+            video_bytes, video_format = video
+            st.video(video_bytes, format=video_format)
+            st.download_button(
+                "⬇️ Download full resolution",
+                data=deferred_video(
+                    process_video_with_fbr, VIDEO_PATH, (JSON_PATH, mtime),
+                    pose, fbr_data, metadata,
+                    sample_stride=sample_stride
+                ),
+                file_name=f"fbr_overlay{VIDEO_EXTENSIONS.get(video_format, '.mp4')}",
+                mime=video_format,
+                on_click="ignore"
+            )
+        else:
+            st.error("Failed to process video")
+
+@st.fragment
+def render_analysis_views(fbr_data, metadata, mtime):
+    """Render the selected analysis view; switching views reruns only this fragment."""
+    st.markdown("### Detailed Analysis")
+    tab_labels = [
+        "🧭 Overview",
+        "📉 COM Vertical",
+        "⚡ Deceleration",
+        "🎯 FBR Score",
+        "📊 Components",
+        "🔄 Combined",
+        "🎯 Efficiency Zones",
+        "⚙️ Energy Absorption",
+        "⏱️ Timing",
+        "🏆 Benchmarks",
+        "📈 Velocity",
+        "💥 Impact Force"
+    ]
+    active_tab = st.radio(
+        "Analysis view",
+        tab_labels,
+        horizontal=True,
+        key="fbr_active_tab",
+        label_visibility="collapsed"
+    )
+    
+    if active_tab == "🧭 Overview":
+        from visualizations.fbr_viz_enhanced import plot_fbr_overview
+        fig = cached_plot(plot_fbr_overview, (JSON_PATH, mtime), fbr_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("COM height, deceleration, velocity and energy absorption in one view - pick a chart above for full detail")
     
-    col1, col2, col3, col4 = st.columns(4)
+    elif active_tab == "📉 COM Vertical":
+        from visualizations.fbr_viz import plot_com_vertical_movement
+        fig = cached_plot(plot_com_vertical_movement, (JSON_PATH, mtime), fbr_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Vertical COM position - shows descent after foot plant")
     
-    with col1:
-        st.metric(
-            "FBR Score",
-            f"{fbr_score:.4f}",
-            delta="Lower is better",
-            delta_color="inverse",
-            help="Braking efficiency - descent/deceleration ratio"
-        )
+    elif active_tab == "⚡ Deceleration":
+        from visualizations.fbr_viz import plot_deceleration_profile
+        fig = cached_plot(plot_deceleration_profile, (JSON_PATH, mtime), fbr_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Deceleration profile - peak indicates braking force")
     
-    with col2:
-        st.metric(
-            "Peak Deceleration",
-            f"{peak_decel:.4f}",
-            help="Maximum braking force at foot plant"
-        )
+    elif active_tab == "🎯 FBR Score":
+        from visualizations.fbr_viz import plot_fbr_score_gauge
+        fig = cached_plot(plot_fbr_score_gauge, (JSON_PATH, mtime), fbr_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("FBR score gauge - lower is better (efficient braking)")
     
-    with col3:
-        st.metric(
-            "Max Descent",
-            f"{max_descent:.4f}",
-            help="Maximum vertical COM drop after foot plant"
-        )
+    elif active_tab == "📊 Components":
+        from visualizations.fbr_viz import plot_descent_vs_deceleration
+        fig = cached_plot(plot_descent_vs_deceleration, (JSON_PATH, mtime), fbr_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("FBR components breakdown")
     
-    with col4:
-        st.metric(
-            "Foot Plant Frame",
-            f"{plant_frame}",
-            delta=f"{plant_frame/fps:.2f}s",
-            help="Frame where front foot plants"
-        )
+    elif active_tab == "🔄 Combined":
+        from visualizations.fbr_viz import plot_combined_analysis
+        fig = cached_plot(plot_combined_analysis, (JSON_PATH, mtime), fbr_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Combined view of COM and deceleration")
+    
+    elif active_tab == "🎯 Efficiency Zones":
+        from visualizations.fbr_viz_enhanced import plot_braking_efficiency_zones
+        fig = cached_plot(plot_braking_efficiency_zones, (JSON_PATH, mtime), fbr_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Color-coded efficiency zones based on COM descent")
+    
+    elif active_tab == "⚙️ Energy Absorption":
+        from visualizations.fbr_viz_enhanced import plot_energy_absorption
+        fig = cached_plot(plot_energy_absorption, (JSON_PATH, mtime), fbr_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Kinetic energy absorption during braking phase")
+    
+    elif active_tab == "⏱️ Timing":
+        from visualizations.fbr_viz_enhanced import plot_timing_metrics
+        fig = cached_plot(plot_timing_metrics, (JSON_PATH, mtime), fbr_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Timing analysis of braking events")
+    
+    elif active_tab == "🏆 Benchmarks":
+        from visualizations.fbr_viz_enhanced import plot_benchmark_comparison_fbr
+        fig = cached_plot(plot_benchmark_comparison_fbr, (JSON_PATH, mtime), fbr_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Compare your FBR score against performance benchmarks")
+    
+    elif active_tab == "📈 Velocity":
+        from visualizations.fbr_viz_enhanced import plot_velocity_profile
+        fig = cached_plot(plot_velocity_profile, (JSON_PATH, mtime), fbr_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Vertical velocity profile - shows rate of descent")
+    
+    elif active_tab == "💥 Impact Force":
+        from visualizations.fbr_viz_enhanced import plot_impact_force_estimate
+        fig = cached_plot(plot_impact_force_estimate, (JSON_PATH, mtime), fbr_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Estimated impact force at foot plant")
 
 def render():
     """Main render function for FBR analysis page."""
@@ -57,8 +179,9 @@ def render():
     st.markdown("Analyze foot plant biomechanics and braking efficiency")
     
     # Load data
-    fbr_data = load_fbr_data(JSON_PATH)
-    metadata = load_metadata(JSON_PATH)
+    mtime = get_mtime(JSON_PATH)
+    fbr_data = load_fbr_data(JSON_PATH, mtime)
+    metadata = load_metadata(JSON_PATH, mtime)
     
     # Handle nested structure
     if "fbr_analysis" in fbr_data:
@@ -102,132 +225,29 @@ def render():
     with col1:
         if assessment["strengths"]:
             st.markdown("**✅ Strengths:**")
-            for strength in assessment["strengths"]:
-                st.success(strength, icon="✅")
+            st.success("\n".join(f"- {strength}" for strength in assessment["strengths"]), icon="✅")
     
     with col2:
         if assessment["areas_for_improvement"]:
             st.markdown("**🎯 Areas for Improvement:**")
-            for area in assessment["areas_for_improvement"]:
-                st.warning(area, icon="🎯")
+            st.warning("\n".join(f"- {area}" for area in assessment["areas_for_improvement"]), icon="🎯")
     
     # Recommendations
     if assessment["recommendations"]:
         with st.expander("💡 **Coaching Recommendations**", expanded=True):
-            for i, rec in enumerate(assessment["recommendations"], 1):
-                st.markdown(f"{i}. {rec}")
+            st.markdown("\n".join(f"{i}. {rec}" for i, rec in enumerate(assessment["recommendations"], 1)))
     
     # Technical notes
     if assessment["technical_notes"]:
         with st.expander("📝 Technical Notes"):
-            for note in assessment["technical_notes"]:
-                st.markdown(f"- {note}")
+            st.markdown("\n".join(f"- {note}" for note in assessment["technical_notes"]))
     
     st.markdown("---")
     
     # Video Section with FBR Overlay
-    st.markdown("### Video with FBR Analysis")
-    
-    with st.spinner("Processing video with FBR annotations..."):
-        from utils.fbr_video_processor import process_video_with_fbr
-        from utils.data_loader import load_pose_data
-        import tempfile
-        
-        pose_data = load_pose_data(JSON_PATH)
-        
-        # Use temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tmp:
-            output_path = tmp.name
-        
-        result = process_video_with_fbr(
-            VIDEO_PATH, pose_data, fbr_data, metadata, output_path
-        )
-        
-        if result:
-            st.video(result)
-        else:
-            st.error("Failed to process video")
+    render_video_section(fbr_data, metadata, mtime)
     
     st.markdown("---")
     
-    # Analysis Tabs
-    st.markdown("### Detailed Analysis")
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11 = st.tabs([
-        "📉 COM Vertical",
-        "⚡ Deceleration",
-        "🎯 FBR Score",
-        "📊 Components",
-        "🔄 Combined",
-        "🎯 Efficiency Zones",
-        "⚙️ Energy Absorption",
-        "⏱️ Timing",
-        "🏆 Benchmarks",
-        "📈 Velocity",
-        "💥 Impact Force"
-    ])
-    
-    with tab1:
-        from visualizations.fbr_viz import plot_com_vertical_movement
-        fig = plot_com_vertical_movement(fbr_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Vertical COM position - shows descent after foot plant")
-    
-    with tab2:
-        from visualizations.fbr_viz import plot_deceleration_profile
-        fig = plot_deceleration_profile(fbr_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Deceleration profile - peak indicates braking force")
-    
-    with tab3:
-        from visualizations.fbr_viz import plot_fbr_score_gauge
-        fig = plot_fbr_score_gauge(fbr_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("FBR score gauge - lower is better (efficient braking)")
-    
-    with tab4:
-        from visualizations.fbr_viz import plot_descent_vs_deceleration
-        fig = plot_descent_vs_deceleration(fbr_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("FBR components breakdown")
-    
-    with tab5:
-        from visualizations.fbr_viz import plot_combined_analysis
-        fig = plot_combined_analysis(fbr_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Combined view of COM and deceleration")
-    
-    with tab6:
-        from visualizations.fbr_viz_enhanced import plot_braking_efficiency_zones
-        fig = plot_braking_efficiency_zones(fbr_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Color-coded efficiency zones based on COM descent")
-    
-    with tab7:
-        from visualizations.fbr_viz_enhanced import plot_energy_absorption
-        fig = plot_energy_absorption(fbr_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Kinetic energy absorption during braking phase")
-    
-    with tab8:
-        from visualizations.fbr_viz_enhanced import plot_timing_metrics
-        fig = plot_timing_metrics(fbr_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Timing analysis of braking events")
-    
-    with tab9:
-        from visualizations.fbr_viz_enhanced import plot_benchmark_comparison_fbr
-        fig = plot_benchmark_comparison_fbr(fbr_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Compare your FBR score against performance benchmarks")
-    
-    with tab10:
-        from visualizations.fbr_viz_enhanced import plot_velocity_profile
-        fig = plot_velocity_profile(fbr_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Vertical velocity profile - shows rate of descent")
-    
-    with tab11:
-        from visualizations.fbr_viz_enhanced import plot_impact_force_estimate
-        fig = plot_impact_force_estimate(fbr_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Estimated impact force at foot plant")
+    # Analysis Tabs - only the selected view is built on each rerun
+    render_analysis_views(fbr_data, metadata, mtime)
@@ -4,7 +4,8 @@ Displays head movement analysis with trajectory, displacement, and stability met
 """
 import streamlit as st
 import os
-from utils.data_loader import load_head_stability_data, load_pose_data, load_metadata
+from utils.data_loader import load_head_stability_data, load_metadata, get_mtime
+from utils.figure_cache import cached_plot
 
 # Constants
 VIDEO_PATH = "data/video_preview_h264.mp4"
@@ -13,44 +14,145 @@ JSON_PATH = "data/analysis_output.json"
 def render_metrics_dashboard(head_data, metadata):
     """Render metrics dashboard with key head stability statistics."""
     fps = metadata.get("fps", 24.0)
+    get = head_data.get
+    
+    score = get("score_0_100", 0.0)
+    stance_frame = get("stance_frame", 0)
+    impact_frame = get("impact_frame", 0)
+    
+    # (label, value, st.metric kwargs), formatted once before any widget call
+    metrics = (
+        ("Stability Score", f"{score:.1f}/100",
+         dict(delta="Excellent" if score >= 80 else "Good" if score >= 60 else "Needs Work",
+              help="Higher score = more stable head position (less jitter)")),
+        ("Stance Frame", f"{stance_frame}",
+         dict(delta=f"{stance_frame/fps:.2f}s",
+              help="Frame where head position stabilizes before delivery")),
+        ("Impact Frame", f"{impact_frame}",
+         dict(delta=f"{impact_frame/fps:.2f}s",
+              help="Frame with maximum head movement (ball release)")),
+    )
+    
+    for col, (label, value, kwargs) in zip(st.columns(len(metrics)), metrics):
+        with col:
+            st.metric(label, value, **kwargs)
+
+@st.fragment
+def render_video_section(head_data, metadata, mtime):
+    """Render the overlay video as a fragment, isolated from the rest of the page."""
+    st.markdown("### Video with Head Tracking")
     
-    score = head_data.get("score_0_100", 0.0)
-    stance_frame = head_data.get("stance_frame", 0)
-    impact_frame = head_data.get("impact_frame", 0)
+    with st.spinner("Processing video with head tracking overlay..."):
+        from utils.head_video_processor import process_video_with_head_tracking
+        from utils.video_processor import compute_sample_stride, compute_preview_scale
+        from utils.video_cache import cached_video, deferred_video, VIDEO_EXTENSIONS
+        from utils.data_loader import load_pose_soa
+        
+        pose = load_pose_soa(JSON_PATH, mtime)
+        
+        # Rendered once per (video, analysis data) version and reused across reruns.
+        # The player gets a <=480p preview; full resolution is encoded only on download.
+        sample_stride = compute_sample_stride(VIDEO_PATH, metadata)
+        video = cached_video(
+            process_video_with_head_tracking, VIDEO_PATH, (JSON_PATH, mtime),
+            pose, head_data, metadata,
+            sample_stride=sample_stride,
+            render_scale=compute_preview_scale(VIDEO_PATH)
+        )
+        
+        if video:
+            video_bytes, video_format = video
+            st.video(video_bytes, format=video_format)
+            st.download_button(
+                "⬇️ Download full resolution",
+                data=deferred_video(
+                    process_video_with_head_tracking, VIDEO_PATH, (JSON_PATH, mtime),
+                    pose, head_data, metadata,
+                    sample_stride=sample_stride
+                ),
+                file_name=f"head_overlay{VIDEO_EXTENSIONS.get(video_format, '.mp4')}",
+                mime=video_format,
+                on_click="ignore"
+            )
+        else:
+            st.error("Failed to process video")
+
+@st.fragment
+def render_analysis_views(head_data, metadata, mtime):
+    """Render the selected analysis view; switching views reruns only this fragment."""
+    st.markdown("### Detailed Analysis")
+    tab_labels = [
+        "🧭 Overview",
+        "🗺️ 2D Trajectory",
+        "📈 Position Over Time",
+        "📉 Displacement",
+        "🔥 Heatmap",
+        "🎯 Stability Zones",
+        "📊 Rolling Score",
+        "⬇️ Head Dip",
+        "🏆 Benchmarks"
+    ]
+    active_tab = st.radio(
+        "Analysis view",
+        tab_labels,
+        horizontal=True,
+        key="head_active_tab",
+        label_visibility="collapsed"
+    )
+    
+    if active_tab == "🧭 Overview":
+        from visualizations.head_viz_enhanced import plot_head_overview
+        fig = cached_plot(plot_head_overview, (JSON_PATH, mtime), head_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Trajectory, displacement, density and rolling stability in one view - pick a chart above for full detail")
     
-    col1, col2, col3 = st.columns(3)
+    elif active_tab == "🗺️ 2D Trajectory":
+        from visualizations.head_viz import plot_head_trajectory_2d
+        fig = cached_plot(plot_head_trajectory_2d, (JSON_PATH, mtime), head_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Shows the path of head movement during delivery - ideally should be minimal")
     
-    with col1:
-        # Color code the score
-        if score >= 80:
-            delta_color = "normal"
-        elif score >= 60:
-            delta_color = "off"
-        else:
-            delta_color = "inverse"
-            
-        st.metric(
-            "Stability Score",
-            f"{score:.1f}/100",
-            delta="Excellent" if score >= 80 else "Good" if score >= 60 else "Needs Work",
-            help="Higher score = more stable head position (less jitter)"
-        )
+    elif active_tab == "📈 Position Over Time":
+        from visualizations.head_viz import plot_head_position_over_time
+        fig = cached_plot(plot_head_position_over_time, (JSON_PATH, mtime), head_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Horizontal and vertical head position changes over time")
     
-    with col2:
-        st.metric(
-            "Stance Frame",
-            f"{stance_frame}",
-            delta=f"{stance_frame/fps:.2f}s",
-            help="Frame where head position stabilizes before delivery"
-        )
+    elif active_tab == "📉 Displacement":
+        from visualizations.head_viz import plot_head_displacement
+        fig = cached_plot(plot_head_displacement, (JSON_PATH, mtime), head_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Frame-to-frame head movement (jitter) - lower is better for consistency")
     
-    with col3:
-        st.metric(
-            "Impact Frame",
-            f"{impact_frame}",
-            delta=f"{impact_frame/fps:.2f}s",
-            help="Frame with maximum head movement (ball release)"
-        )
+    elif active_tab == "🔥 Heatmap":
+        from visualizations.head_viz import create_head_heatmap
+        fig = cached_plot(create_head_heatmap, (JSON_PATH, mtime), head_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Density map showing where head position is concentrated during delivery")
+    
+    elif active_tab == "🎯 Stability Zones":
+        from visualizations.head_viz_enhanced import plot_stability_zones
+        fig = cached_plot(plot_stability_zones, (JSON_PATH, mtime), head_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Color-coded zones showing stability - green (stable), yellow (acceptable), red (unstable)")
+    
+    elif active_tab == "📊 Rolling Score":
+        from visualizations.head_viz_enhanced import plot_rolling_stability
+        fig = cached_plot(plot_rolling_stability, (JSON_PATH, mtime), head_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Frame-by-frame stability score - identifies specific unstable periods")
+    
+    elif active_tab == "⬇️ Head Dip":
+        from visualizations.head_viz_enhanced import plot_head_dip_analysis
+        fig = cached_plot(plot_head_dip_analysis, (JSON_PATH, mtime), head_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Vertical head movement analysis - excessive dip affects line and length")
+    
+    elif active_tab == "🏆 Benchmarks":
+        from visualizations.head_viz_enhanced import plot_benchmark_comparison
+        fig = cached_plot(plot_benchmark_comparison, (JSON_PATH, mtime), head_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Compare your stability score against professional benchmarks")
 
 def render():
     """Main render function for head stability analysis page."""
@@ -67,9 +169,9 @@ def render():
         return
     
     # Load data
-    head_data = load_head_stability_data(JSON_PATH)
-    pose_data = load_pose_data(JSON_PATH)
-    metadata = load_metadata(JSON_PATH)
+    mtime = get_mtime(JSON_PATH)
+    head_data = load_head_stability_data(JSON_PATH, mtime)
+    metadata = load_metadata(JSON_PATH, mtime)
     
     if not head_data:
         st.warning("No head stability data found in JSON file")
@@ -109,109 +211,29 @@ def render():
     with col1:
         if assessment["strengths"]:
             st.markdown("**✅ Strengths:**")
-            for strength in assessment["strengths"]:
-                st.success(strength, icon="✅")
+            st.success("\n".join(f"- {strength}" for strength in assessment["strengths"]), icon="✅")
     
     with col2:
         if assessment["areas_for_improvement"]:
             st.markdown("**🎯 Areas for Improvement:**")
-            for area in assessment["areas_for_improvement"]:
-                st.warning(area, icon="🎯")
+            st.warning("\n".join(f"- {area}" for area in assessment["areas_for_improvement"]), icon="🎯")
     
     # Recommendations
     if assessment["recommendations"]:
         with st.expander("💡 **Coaching Recommendations**", expanded=True):
-            for i, rec in enumerate(assessment["recommendations"], 1):
-                st.markdown(f"{i}. {rec}")
+            st.markdown("\n".join(f"{i}. {rec}" for i, rec in enumerate(assessment["recommendations"], 1)))
     
     # Technical notes
     if assessment["technical_notes"]:
         with st.expander("📝 Technical Notes"):
-            for note in assessment["technical_notes"]:
-                st.markdown(f"- {note}")
+            st.markdown("\n".join(f"- {note}" for note in assessment["technical_notes"]))
     
     st.markdown("---")
     
     # Video Section with Head Tracking
-    st.markdown("### Video with Head Tracking")
-    
-    with st.spinner("Processing video with head tracking overlay..."):
-        from utils.head_video_processor import process_video_with_head_tracking
-        import tempfile
-        
-        # Use temp file that will be auto-deleted
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tmp:
-            output_path = tmp.name
-        
-        result = process_video_with_head_tracking(
-            VIDEO_PATH, pose_data, head_data, metadata, output_path
-        )
-        
-        if result:
-            st.video(result)
-            # Note: File will be cleaned up by OS temp directory cleanup
-        else:
-            st.error("Failed to process video")
+    render_video_section(head_data, metadata, mtime)
     
     st.markdown("---")
     
-    # Analysis Tabs
-    st.markdown("### Detailed Analysis")
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
-        "🗺️ 2D Trajectory",
-        "📈 Position Over Time",
-        "📉 Displacement",
-        "🔥 Heatmap",
-        "🎯 Stability Zones",
-        "📊 Rolling Score",
-        "⬇️ Head Dip",
-        "🏆 Benchmarks"
-    ])
-    
-    with tab1:
-        from visualizations.head_viz import plot_head_trajectory_2d
-        fig = plot_head_trajectory_2d(head_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Shows the path of head movement during delivery - ideally should be minimal")
-    
-    with tab2:
-        from visualizations.head_viz import plot_head_position_over_time
-        fig = plot_head_position_over_time(head_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Horizontal and vertical head position changes over time")
-    
-    with tab3:
-        from visualizations.head_viz import plot_head_displacement
-        fig = plot_head_displacement(head_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Frame-to-frame head movement (jitter) - lower is better for consistency")
-    
-    with tab4:
-        from visualizations.head_viz import create_head_heatmap
-        fig = create_head_heatmap(head_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Density map showing where head position is concentrated during delivery")
-    
-    with tab5:
-        from visualizations.head_viz_enhanced import plot_stability_zones
-        fig = plot_stability_zones(head_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Color-coded zones showing stability - green (stable), yellow (acceptable), red (unstable)")
-    
-    with tab6:
-        from visualizations.head_viz_enhanced import plot_rolling_stability
-        fig = plot_rolling_stability(head_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Frame-by-frame stability score - identifies specific unstable periods")
-    
-    with tab7:
-        from visualizations.head_viz_enhanced import plot_head_dip_analysis
-        fig = plot_head_dip_analysis(head_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Vertical head movement analysis - excessive dip affects line and length")
-    
-    with tab8:
-        from visualizations.head_viz_enhanced import plot_benchmark_comparison
-        fig = plot_benchmark_comparison(head_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Compare your stability score against professional benchmarks")
+    # Analysis Tabs - only the selected view is built on each rerun
+    render_analysis_views(head_data, metadata, mtime)
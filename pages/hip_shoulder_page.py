@@ -3,7 +3,8 @@ Hip-Shoulder Separation Analysis Page
 Displays hip-shoulder angle analysis with separation metrics and AI assessment.
 """
 import streamlit as st
-from utils.data_loader import load_hip_shoulder_data, load_metadata
+from utils.data_loader import load_hip_shoulder_data, load_metadata, get_mtime
+from utils.figure_cache import cached_plot
 
 # Constants
 VIDEO_PATH = "data/video_preview_h264.mp4"
@@ -52,14 +53,132 @@ def render_metrics_dashboard(hs_data, metadata):
             help="Frame with maximum separation"
         )
 
+@st.fragment
+def render_video_section(hs_data, metadata, mtime):
+    """Render the overlay video as a fragment, isolated from the rest of the page."""
+    st.markdown("### Video with Hip-Shoulder Separation")
+    
+    with st.spinner("Processing video with hip-shoulder annotations..."):
+        from utils.hip_shoulder_video_processor import process_video_with_hip_shoulder
+        from utils.video_processor import compute_sample_stride, compute_preview_scale
+        from utils.video_cache import cached_video, deferred_video, VIDEO_EXTENSIONS
+        from utils.data_loader import load_pose_soa
+        
+        pose = load_pose_soa(JSON_PATH, mtime)
+        
+        # Rendered once per (video, analysis data) version and reused across reruns.
+        # The player gets a <=480p preview; full resolution is encoded only on download.
+        sample_stride = compute_sample_stride(VIDEO_PATH, metadata)
+        video = cached_video(
+            process_video_with_hip_shoulder, VIDEO_PATH, (JSON_PATH, mtime),
+            pose, hs_data, metadata,
+            sample_stride=sample_stride,
+            render_scale=compute_preview_scale(VIDEO_PATH)
+        )
+        
+        if video:
+            video_bytes, video_format = video
+            st.video(video_bytes, format=video_format)
+            st.download_button(
+                "⬇️ Download full resolution",
+                data=deferred_video(
+                    process_video_with_hip_shoulder, VIDEO_PATH, (JSON_PATH, mtime),
+                    pose, hs_data, metadata,
+                    sample_stride=sample_stride
+                ),
+                file_name=f"hip_shoulder_overlay{VIDEO_EXTENSIONS.get(video_format, '.mp4')}",
+                mime=video_format,
+                on_click="ignore"
+            )
+        else:
+            st.error("Failed to process video")
+
+@st.fragment
+def render_analysis_views(hs_data, metadata, mtime):
+    """Render the selected analysis view; switching views reruns only this fragment."""
+    st.markdown("### Detailed Analysis")
+    tab_labels = [
+        "📈 Separation Angle",
+        "⚡ Separation Rate",
+        "📊 Phase Breakdown",
+        "🎯 Separation Zones",
+        "⚙️ Power Generation",
+        "⏱️ Timing Analysis",
+        "🔄 Hip vs Shoulder",
+        "🏆 Benchmarks",
+        "📉 Frame-by-Frame"
+    ]
+    active_tab = st.radio(
+        "Analysis view",
+        tab_labels,
+        horizontal=True,
+        key="hs_active_tab",
+        label_visibility="collapsed"
+    )
+    
+    if active_tab == "📈 Separation Angle":
+        from visualizations.hip_shoulder_viz import plot_separation_angle
+        fig = cached_plot(plot_separation_angle, (JSON_PATH, mtime), hs_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Hip-shoulder separation angle throughout delivery - peak indicates maximum 'X-factor'")
+    
+    elif active_tab == "⚡ Separation Rate":
+        from visualizations.hip_shoulder_viz import plot_separation_rate
+        fig = cached_plot(plot_separation_rate, (JSON_PATH, mtime), hs_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Angular velocity of separation - higher values indicate more explosive hip rotation")
+    
+    elif active_tab == "📊 Phase Breakdown":
+        from visualizations.hip_shoulder_viz import plot_separation_phases
+        fig = cached_plot(plot_separation_phases, (JSON_PATH, mtime), hs_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Average separation in different phases of delivery")
+    
+    elif active_tab == "🎯 Separation Zones":
+        from visualizations.hip_shoulder_viz_enhanced import plot_separation_zones
+        fig = cached_plot(plot_separation_zones, (JSON_PATH, mtime), hs_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Color-coded zones: Elite (>45°), Good (35-45°), Developing (25-35°), Poor (<25°)")
+    
+    elif active_tab == "⚙️ Power Generation":
+        from visualizations.hip_shoulder_viz_enhanced import plot_power_generation
+        fig = cached_plot(plot_power_generation, (JSON_PATH, mtime), hs_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Power generation index and estimated ball speed potential based on separation")
+    
+    elif active_tab == "⏱️ Timing Analysis":
+        from visualizations.hip_shoulder_viz_enhanced import plot_timing_analysis
+        fig = cached_plot(plot_timing_analysis, (JSON_PATH, mtime), hs_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Timing of separation events - time to peak and peak duration")
+    
+    elif active_tab == "🔄 Hip vs Shoulder":
+        from visualizations.hip_shoulder_viz_enhanced import plot_hip_vs_shoulder_rotation
+        fig = cached_plot(plot_hip_vs_shoulder_rotation, (JSON_PATH, mtime), hs_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Separate tracking of hip and shoulder rotation - shows the 'lag' effect")
+    
+    elif active_tab == "🏆 Benchmarks":
+        from visualizations.hip_shoulder_viz_enhanced import plot_benchmark_comparison_hs
+        fig = cached_plot(plot_benchmark_comparison_hs, (JSON_PATH, mtime), hs_data)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Compare your separation against different bowling types")
+    
+    elif active_tab == "📉 Frame-by-Frame":
+        from visualizations.hip_shoulder_viz_enhanced import plot_frame_by_frame_rate
+        fig = cached_plot(plot_frame_by_frame_rate, (JSON_PATH, mtime), hs_data, metadata)
+        st.plotly_chart(fig, width='stretch')
+        st.caption("Angular velocity and acceleration - identifies explosive moments")
+
 def render():
     """Main render function for hip-shoulder analysis page."""
     st.title("💪 Hip-Shoulder Separation Analysis")
     st.markdown("Analyze the 'X-factor' - hip rotation ahead of shoulders for power generation")
     
     # Load data
-    hs_data = load_hip_shoulder_data(JSON_PATH)
-    metadata = load_metadata(JSON_PATH)
+    mtime = get_mtime(JSON_PATH)
+    hs_data = load_hip_shoulder_data(JSON_PATH, mtime)
+    metadata = load_metadata(JSON_PATH, mtime)
     
     # Handle nested structure
     if "hip_shoulder_separation" in hs_data:
@@ -103,118 +222,29 @@ def render():
     with col1:
         if assessment["strengths"]:
             st.markdown("**✅ Strengths:**")
-            for strength in assessment["strengths"]:
-                st.success(strength, icon="✅")
+            st.success("\n".join(f"- {strength}" for strength in assessment["strengths"]), icon="✅")
     
     with col2:
         if assessment["areas_for_improvement"]:
             st.markdown("**🎯 Areas for Improvement:**")
-            for area in assessment["areas_for_improvement"]:
-                st.warning(area, icon="🎯")
+            st.warning("\n".join(f"- {area}" for area in assessment["areas_for_improvement"]), icon="🎯")
     
     # Recommendations
     if assessment["recommendations"]:
         with st.expander("💡 **Coaching Recommendations**", expanded=True):
-            for i, rec in enumerate(assessment["recommendations"], 1):
-                st.markdown(f"{i}. {rec}")
+            st.markdown("\n".join(f"{i}. {rec}" for i, rec in enumerate(assessment["recommendations"], 1)))
     
     # Technical notes
     if assessment["technical_notes"]:
         with st.expander("📝 Technical Notes"):
-            for note in assessment["technical_notes"]:
-                st.markdown(f"- {note}")
+            st.markdown("\n".join(f"- {note}" for note in assessment["technical_notes"]))
     
     st.markdown("---")
     
     # Video Section with Hip-Shoulder Overlay
-    st.markdown("### Video with Hip-Shoulder Separation")
-    
-    with st.spinner("Processing video with hip-shoulder annotations..."):
-        from utils.hip_shoulder_video_processor import process_video_with_hip_shoulder
-        from utils.data_loader import load_pose_data
-        import tempfile
-        
-        pose_data = load_pose_data(JSON_PATH)
-        
-        # Use temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tmp:
-            output_path = tmp.name
-        
-        result = process_video_with_hip_shoulder(
-            VIDEO_PATH, pose_data, hs_data, metadata, output_path
-        )
-        
-        if result:
-            st.video(result)
-        else:
-            st.error("Failed to process video")
+    render_video_section(hs_data, metadata, mtime)
     
     st.markdown("---")
     
-    # Analysis Tabs
-    st.markdown("### Detailed Analysis")
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
-        "📈 Separation Angle",
-        "⚡ Separation Rate",
-        "📊 Phase Breakdown",
-        "🎯 Separation Zones",
-        "⚙️ Power Generation",
-        "⏱️ Timing Analysis",
-        "🔄 Hip vs Shoulder",
-        "🏆 Benchmarks",
-        "📉 Frame-by-Frame"
-    ])
-    
-    with tab1:
-        from visualizations.hip_shoulder_viz import plot_separation_angle
-        fig = plot_separation_angle(hs_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Hip-shoulder separation angle throughout delivery - peak indicates maximum 'X-factor'")
-    
-    with tab2:
-        from visualizations.hip_shoulder_viz import plot_separation_rate
-        fig = plot_separation_rate(hs_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Angular velocity of separation - higher values indicate more explosive hip rotation")
-    
-    with tab3:
-        from visualizations.hip_shoulder_viz import plot_separation_phases
-        fig = plot_separation_phases(hs_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Average separation in different phases of delivery")
-    
-    with tab4:
-        from visualizations.hip_shoulder_viz_enhanced import plot_separation_zones
-        fig = plot_separation_zones(hs_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Color-coded zones: Elite (>45°), Good (35-45°), Developing (25-35°), Poor (<25°)")
-    
-    with tab5:
-        from visualizations.hip_shoulder_viz_enhanced import plot_power_generation
-        fig = plot_power_generation(hs_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Power generation index and estimated ball speed potential based on separation")
-    
-    with tab6:
-        from visualizations.hip_shoulder_viz_enhanced import plot_timing_analysis
-        fig = plot_timing_analysis(hs_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Timing of separation events - time to peak and peak duration")
-    
-    with tab7:
-        from visualizations.hip_shoulder_viz_enhanced import plot_hip_vs_shoulder_rotation
-        fig = plot_hip_vs_shoulder_rotation(hs_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Separate tracking of hip and shoulder rotation - shows the 'lag' effect")
-    
-    with tab8:
-        from visualizations.hip_shoulder_viz_enhanced import plot_benchmark_comparison_hs
-        fig = plot_benchmark_comparison_hs(hs_data)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Compare your separation against different bowling types")
-    
-    with tab9:
-        from visualizations.hip_shoulder_viz_enhanced import plot_frame_by_frame_rate
-        fig = plot_frame_by_frame_rate(hs_data, metadata)
-        st.plotly_chart(fig, width='stretch')
-        st.caption("Angular velocity and acceleration - identifies explosive moments")
+    # Analysis Tabs - only the selected view is built on each rerun
+    render_analysis_views(hs_data, metadata, mtime)
@@ -3,7 +3,8 @@ Kinematics Analysis Page
 Displays kinematic sequencing analysis with hip-torso-shoulder coordination.
 """
 import streamlit as st
-from utils.data_loader import load_kinematics_data, load_metadata
+from utils.data_loader import load_kinematics_data, load_metadata, get_mtime
+from utils.figure_cache import cached_plot
 
 # Constants
 VIDEO_PATH = "data/video_preview_h264.mp4"
@@ -58,109 +59,51 @@ def render_metrics_dashboard(kin_data, metadata):
             help="Delay between torso and shoulder peaks"
         )
 
-def render():
-    """Main render function for kinematics analysis page."""
-    st.title("🔄 Kinematic Sequencing Analysis")
-    st.markdown("Analyze hip → torso → shoulder rotation coordination")
-    
-    # Load data
-    kin_data = load_kinematics_data(JSON_PATH)
-    metadata = load_metadata(JSON_PATH)
-    
-    # Handle nested structure
-    if "kinematic_sequencing" in kin_data:
-        kin_data = kin_data.get("kinematic_sequencing", {})
-    
-    if not kin_data:
-        st.warning("No kinematics data found in JSON file")
-        return
-    
-    # Metrics Dashboard
-    st.markdown("### Key Metrics")
-    render_metrics_dashboard(kin_data, metadata)
-    
-    st.markdown("---")
-    
-    # AI Assessment Section
-    st.markdown("### 🤖 AI Coaching Assessment")
-    from utils.assessment import assess_kinematics, get_kinematics_interpretation
-    
-    assessment = assess_kinematics(kin_data, metadata)
-    
-    # Overall rating
-    col1, col2 = st.columns([1, 3])
-    with col1:
-        rating_emoji = {
-            "Elite": "👑",
-            "Excellent": "🌟",
-            "Good": "👍",
-            "Developing": "📈",
-            "Needs Work": "⚠️"
-        }
-        st.markdown(f"## {rating_emoji.get(assessment['overall_rating'], '📊')} {assessment['overall_rating']}")
-    
-    with col2:
-        score = kin_data.get("score", 0.0)
-        interpretation = get_kinematics_interpretation(score)
-        st.info(f"**Interpretation:** {interpretation}")
-    
-    # Strengths and improvements
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if assessment["strengths"]:
-            st.markdown("**✅ Strengths:**")
-            for strength in assessment["strengths"]:
-                st.success(strength, icon="✅")
-    
-    with col2:
-        if assessment["areas_for_improvement"]:
-            st.markdown("**🎯 Areas for Improvement:**")
-            for area in assessment["areas_for_improvement"]:
-                st.warning(area, icon="🎯")
-    
-    # Recommendations
-    if assessment["recommendations"]:
-        with st.expander("💡 **Coaching Recommendations**", expanded=True):
-            for i, rec in enumerate(assessment["recommendations"], 1):
-                st.markdown(f"{i}. {rec}")
-    
-    # Technical notes
-    if assessment["technical_notes"]:
-        with st.expander("📝 Technical Notes"):
-            for note in assessment["technical_notes"]:
-                st.markdown(f"- {note}")
-    
-    st.markdown("---")
-    
-    # Video Section with Kinematics Overlay
+@st.fragment
+def render_video_section(kin_data, metadata, mtime):
+    """Render the overlay video as a fragment, isolated from the rest of the page."""
     st.markdown("### Video with Kinematic Sequencing")
     
     with st.spinner("Processing video with kinematics annotations..."):
         from utils.kinematics_video_processor import process_video_with_kinematics
-        from utils.data_loader import load_pose_data
-        import tempfile
-        
-        pose_data = load_pose_data(JSON_PATH)
+        from utils.video_processor import compute_sample_stride, compute_preview_scale
+        from utils.video_cache import cached_video, deferred_video, VIDEO_EXTENSIONS
+        from utils.data_loader import load_pose_soa
         
-        # Use temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tmp:
-            output_path = tmp.name
+        pose = load_pose_soa(JSON_PATH, mtime)
         
-        result = process_video_with_kinematics(
-            VIDEO_PATH, pose_data, kin_data, metadata, output_path
+        # Rendered once per (video, analysis data) version and reused across reruns.
+        # The player gets a <=480p preview; full resolution is encoded only on download.
+        sample_stride = compute_sample_stride(VIDEO_PATH, metadata)
+        video = cached_video(
+            process_video_with_kinematics, VIDEO_PATH, (JSON_PATH, mtime),
+            pose, kin_data, metadata,
+            sample_stride=sample_stride,
+            render_scale=compute_preview_scale(VIDEO_PATH)
         )
         
-        if result:
-            st.video(result)
+        if video:
+            video_bytes, video_format = video
+            st.video(video_bytes, format=video_format)
+            st.download_button(
+                "⬇️ Download full resolution",
+                data=deferred_video(
+                    process_video_with_kinematics, VIDEO_PATH, (JSON_PATH, mtime),
+                    pose, kin_data, metadata,
+                    sample_stride=sample_stride
+                ),
+                file_name=f"kinematics_overlay{VIDEO_EXTENSIONS.get(video_format, '.mp4')}",
+                mime=video_format,
+                on_click="ignore"
+            )
         else:
             st.error("Failed to process video")
-    
-    st.markdown("---")
-    
-    # Analysis Tabs
+
+@st.fragment
+def render_analysis_views(kin_data, metadata, mtime):
+    """Render the selected analysis view; switching views reruns only this fragment."""
     st.markdown("### Detailed Analysis")
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11, tab12, tab13, tab14, tab15, tab16 = st.tabs([
+    tab_labels = [
         "📈 Velocity Timeline",
         "💧 Waterfall",
         "⏱️ Timing Diagram",
@@ -177,101 +120,187 @@ def render():
         "⚙️ Power Flow",
         "🔥 Timing Heatmap",
         "💎 Efficiency Breakdown"
-    ])
-    
-    with tab1:
+    ]
+    active_tab = st.radio(
+        "Analysis view",
+        tab_labels,
+        horizontal=True,
+        key="kin_active_tab",
+        label_visibility="collapsed"
+    )
+    
+    if active_tab == "📈 Velocity Timeline":
         from visualizations.kinematics_viz import plot_angular_velocity_timeline
-        fig = plot_angular_velocity_timeline(kin_data, metadata)
+        fig = cached_plot(plot_angular_velocity_timeline, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Angular velocities of hip, torso, and shoulder - shows sequencing pattern")
     
-    with tab2:
+    elif active_tab == "💧 Waterfall":
         from visualizations.kinematics_viz import plot_sequencing_waterfall
-        fig = plot_sequencing_waterfall(kin_data, metadata)
+        fig = cached_plot(plot_sequencing_waterfall, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Cascade showing hip → torso → shoulder peak progression")
     
-    with tab3:
+    elif active_tab == "⏱️ Timing Diagram":
         from visualizations.kinematics_viz import plot_timing_diagram
-        fig = plot_timing_diagram(kin_data, metadata)
+        fig = cached_plot(plot_timing_diagram, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Delays between segment peaks (ideal: 30ms each)")
     
-    with tab4:
+    elif active_tab == "🎯 Score Gauge":
         from visualizations.kinematics_viz import plot_sequencing_score_gauge
-        fig = plot_sequencing_score_gauge(kin_data)
+        fig = cached_plot(plot_sequencing_score_gauge, (JSON_PATH, mtime), kin_data)
         st.plotly_chart(fig, width='stretch')
         st.caption("Overall sequencing quality score")
     
-    with tab5:
+    elif active_tab == "📊 Velocity Comparison":
         from visualizations.kinematics_viz import plot_velocity_comparison
-        fig = plot_velocity_comparison(kin_data)
+        fig = cached_plot(plot_velocity_comparison, (JSON_PATH, mtime), kin_data)
         st.plotly_chart(fig, width='stretch')
         st.caption("Peak velocities by body segment")
     
-    with tab6:
+    elif active_tab == "🎨 Sequencing Zones":
         from visualizations.kinematics_viz_enhanced import plot_sequencing_zones
-        fig = plot_sequencing_zones(kin_data, metadata)
+        fig = cached_plot(plot_sequencing_zones, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Color-coded zones showing dominant segment by phase")
     
-    with tab7:
+    elif active_tab == "⚡ Energy Transfer":
         from visualizations.kinematics_viz_enhanced import plot_energy_transfer_efficiency
-        fig = plot_energy_transfer_efficiency(kin_data)
+        fig = cached_plot(plot_energy_transfer_efficiency, (JSON_PATH, mtime), kin_data)
         st.plotly_chart(fig, width='stretch')
         st.caption("Energy distribution across segments")
     
-    with tab8:
+    elif active_tab == "📉 Timing Deviation":
         from visualizations.kinematics_viz_enhanced import plot_timing_deviation
-        fig = plot_timing_deviation(kin_data, metadata)
+        fig = cached_plot(plot_timing_deviation, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Deviation from ideal 30ms delays")
     
-    with tab9:
+    elif active_tab == "🏆 Benchmarks":
         from visualizations.kinematics_viz_enhanced import plot_benchmark_comparison_kin
-        fig = plot_benchmark_comparison_kin(kin_data)
+        fig = cached_plot(plot_benchmark_comparison_kin, (JSON_PATH, mtime), kin_data)
         st.plotly_chart(fig, width='stretch')
         st.caption("Compare your sequencing score against benchmarks")
     
-    with tab10:
+    elif active_tab == "🎯 Coordination Index":
         from visualizations.kinematics_viz_enhanced import plot_coordination_index
-        fig = plot_coordination_index(kin_data, metadata)
+        fig = cached_plot(plot_coordination_index, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Overall coordination quality metrics")
     
-    with tab11:
+    elif active_tab == "🔍 Segment Comparison":
         from visualizations.kinematics_viz_enhanced import plot_segment_comparison
-        fig = plot_segment_comparison(kin_data, metadata)
+        fig = cached_plot(plot_segment_comparison, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Detailed comparison of all three segments")
     
-    with tab12:
+    elif active_tab == "🌐 3D Rotation":
         from visualizations.kinematics_viz_ultra import plot_3d_rotation_animation
-        fig = plot_3d_rotation_animation(kin_data, metadata)
+        fig = cached_plot(plot_3d_rotation_animation, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("3D visualization of rotation trajectories through time")
     
-    with tab13:
+    elif active_tab == "🔄 Phase Portrait":
         from visualizations.kinematics_viz_ultra import plot_phase_portrait
-        fig = plot_phase_portrait(kin_data, metadata)
+        fig = cached_plot(plot_phase_portrait, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Phase space analysis - velocity vs acceleration for each segment")
     
-    with tab14:
+    elif active_tab == "⚙️ Power Flow":
         from visualizations.kinematics_viz_ultra import plot_power_flow_diagram
-        fig = plot_power_flow_diagram(kin_data, metadata)
+        fig = cached_plot(plot_power_flow_diagram, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Sankey diagram showing energy flow through kinematic chain")
     
-    with tab15:
+    elif active_tab == "🔥 Timing Heatmap":
         from visualizations.kinematics_viz_ultra import plot_comparative_timing_heatmap
-        fig = plot_comparative_timing_heatmap(kin_data, metadata)
+        fig = cached_plot(plot_comparative_timing_heatmap, (JSON_PATH, mtime), kin_data, metadata)
         st.plotly_chart(fig, width='stretch')
         st.caption("Heatmap comparing actual vs ideal timing patterns")
     
-    with tab16:
+    elif active_tab == "💎 Efficiency Breakdown":
         from visualizations.kinematics_viz_ultra import plot_efficiency_score_breakdown
-        fig = plot_efficiency_score_breakdown(kin_data)
+        fig = cached_plot(plot_efficiency_score_breakdown, (JSON_PATH, mtime), kin_data)
         st.plotly_chart(fig, width='stretch')
         st.caption("Polar chart breaking down efficiency score components")
 
+def render():
+    """Main render function for kinematics analysis page."""
+    st.title("🔄 Kinematic Sequencing Analysis")
+    st.markdown("Analyze hip → torso → shoulder rotation coordination")
+    
+    # Load data
+    mtime = get_mtime(JSON_PATH)
+    kin_data = load_kinematics_data(JSON_PATH, mtime)
+    metadata = load_metadata(JSON_PATH, mtime)
+    
+    # Handle nested structure
+    if "kinematic_sequencing" in kin_data:
+        kin_data = kin_data.get("kinematic_sequencing", {})
+    
+    if not kin_data:
+        st.warning("No kinematics data found in JSON file")
+        return
+    
+    # Metrics Dashboard
+    st.markdown("### Key Metrics")
+    render_metrics_dashboard(kin_data, metadata)
+    
+    st.markdown("---")
+    
+    # AI Assessment Section
+    st.markdown("### 🤖 AI Coaching Assessment")
+    from utils.assessment import assess_kinematics, get_kinematics_interpretation
+    
+    assessment = assess_kinematics(kin_data, metadata)
+    
+    # Overall rating
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        rating_emoji = {
+            "Elite": "👑",
+            "Excellent": "🌟",
+            "Good": "👍",
+            "Developing": "📈",
+            "Needs Work": "⚠️"
+        }
+        st.markdown(f"## {rating_emoji.get(assessment['overall_rating'], '📊')} {assessment['overall_rating']}")
+    
+    with col2:
+        score = kin_data.get("score", 0.0)
+        interpretation = get_kinematics_interpretation(score)
+        st.info(f"**Interpretation:** {interpretation}")
+    
+    # Strengths and improvements
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if assessment["strengths"]:
+            st.markdown("**✅ Strengths:**")
+            st.success("\n".join(f"- {strength}" for strength in assessment["strengths"]), icon="✅")
+    
+    with col2:
+        if assessment["areas_for_improvement"]:
+            st.markdown("**🎯 Areas for Improvement:**")
+            st.warning("\n".join(f"- {area}" for area in assessment["areas_for_improvement"]), icon="🎯")
+    
+    # Recommendations
+    if assessment["recommendations"]:
+        with st.expander("💡 **Coaching Recommendations**", expanded=True):
+            st.markdown("\n".join(f"{i}. {rec}" for i, rec in enumerate(assessment["recommendations"], 1)))
+    
+    # Technical notes
+    if assessment["technical_notes"]:
+        with st.expander("📝 Technical Notes"):
+            st.markdown("\n".join(f"- {note}" for note in assessment["technical_notes"]))
+    
+    st.markdown("---")
+    
+    # Video Section with Kinematics Overlay
+    render_video_section(kin_data, metadata, mtime)
+    
+    st.markdown("---")
+    
+    # Analysis Tabs - only the selected view is built on each rerun
+    render_analysis_views(kin_data, metadata, mtime)
@@ -5,6 +5,9 @@ Main entry point with sidebar navigation for 5 analysis features.
 import streamlit as st
 import sys
 import os
+import importlib
+import pkgutil
+import threading
 
 # Add notebook directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -16,19 +19,46 @@ st.set_page_config(
     layout="wide"
 )
 
+# Sidebar label -> module in the pages package
+PAGES = {
+    "COM Analysis": "com_page",
+    "Kinematics": "kinematics_page",
+    "Hip-Shoulder": "hip_shoulder_page",
+    "Head Stability": "head_page",
+    "FBR": "fbr_page",
+}
+
+@st.cache_resource(show_spinner=False)
+def _preload_modules():
+    """
+    Import every page and the utils/visualizations modules their render()
+    imports lazily, once per process on a background thread, so the first
+    visit to a page does not wait on plotly and cv2 imports.
+    """
+    def load():
+        names = [f"pages.{module_name}" for module_name in PAGES.values()]
+        for package in ("utils", "visualizations"):
+            path = importlib.import_module(package).__path__
+            names += [f"{package}.{info.name}" for info in pkgutil.iter_modules(path)]
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"Preloading {name} failed: {e}")
+    
+    thread = threading.Thread(target=load, name="preload-modules", daemon=True)
+    thread.start()
+    return thread
+
+_preload_modules()
+
 # Sidebar navigation
 st.sidebar.title("🏏 Cricket Kinematics")
 st.sidebar.markdown("---")
 
 feature = st.sidebar.radio(
     "Select Analysis Feature:",
-    [
-        "COM Analysis",
-        "Kinematics",
-        "Hip-Shoulder",
-        "Head Stability",
-        "FBR"
-    ],
+    list(PAGES),
     index=0
 )
 
@@ -36,18 +66,4 @@ st.sidebar.markdown("---")
 st.sidebar.info("**Data**: `data/analysis_output.json`")
 
 # Route to appropriate page
-if feature == "COM Analysis":
-    from pages import com_page
-    com_page.render()
-elif feature == "Kinematics":
-    from pages import kinematics_page
-    kinematics_page.render()
-elif feature == "Hip-Shoulder":
-    from pages import hip_shoulder_page
-    hip_shoulder_page.render()
-elif feature == "Head Stability":
-    from pages import head_page
-    head_page.render()
-elif feature == "FBR":
-    from pages import fbr_page
-    fbr_page.render()
+importlib.import_module(f"pages.{PAGES[feature]}").render()
@@ -2,6 +2,22 @@
 Assessment and coaching insights for cricket kinematics analysis.
 Provides interpretations and recommendations based on biomechanical data.
 """
+from bisect import bisect_right
+import numpy as np
+
+def _interpret(bands, value, nan_band=-1):
+    """
+    Look up the text for value in a (thresholds, texts) band table.
+    
+    thresholds are ascending lower bounds; texts has one more entry than
+    thresholds, texts[0] covering everything below the first bound.
+    nan_band is the band a NaN value falls into, matching the else branch
+    of the comparison ladder the table replaced.
+    """
+    thresholds, texts = bands
+    if value != value:
+        return texts[nan_band]
+    return texts[bisect_right(thresholds, value)]
 
 def assess_com_performance(com_data, metadata):
     """
@@ -113,6 +129,13 @@ def assess_com_performance(com_data, metadata):
     
     return assessment
 
+COM_SHIFT_BANDS = ((15, 30, 50), (
+    "Minimal lateral movement - may indicate upright bowling or limited power generation",
+    "Moderate lateral movement - typical for medium-pace bowlers",
+    "Strong lateral movement - characteristic of fast bowlers with good momentum",
+    "Very strong lateral movement - aggressive weight transfer, ensure control is maintained",
+))
+
 def get_com_interpretation(com_shift_percent):
     """
     Get interpretation of COM shift percentage.
@@ -123,16 +146,14 @@ def get_com_interpretation(com_shift_percent):
     Returns:
         String interpretation
     """
-    abs_shift = abs(com_shift_percent)
-    
-    if abs_shift < 15:
-        return "Minimal lateral movement - may indicate upright bowling or limited power generation"
-    elif abs_shift < 30:
-        return "Moderate lateral movement - typical for medium-pace bowlers"
-    elif abs_shift < 50:
-        return "Strong lateral movement - characteristic of fast bowlers with good momentum"
-    else:
-        return "Very strong lateral movement - aggressive weight transfer, ensure control is maintained"
+    return _interpret(COM_SHIFT_BANDS, abs(com_shift_percent))
+
+# (label, low, high) COM shift ranges, as % of stance width
+COM_BENCHMARKS = (
+    ("Spin Bowler", 10, 25),
+    ("Medium Pace", 25, 40),
+    ("Fast Bowler", 35, 60),
+)
 
 def get_benchmark_comparison(com_shift_percent):
     """
@@ -146,16 +167,7 @@ def get_benchmark_comparison(com_shift_percent):
     """
     abs_shift = abs(com_shift_percent)
     
-    benchmarks = {
-        "spin_bowler": {"range": (10, 25), "label": "Spin Bowler"},
-        "medium_pace": {"range": (25, 40), "label": "Medium Pace"},
-        "fast_bowler": {"range": (35, 60), "label": "Fast Bowler"},
-    }
-    
-    matches = []
-    for key, data in benchmarks.items():
-        if data["range"][0] <= abs_shift <= data["range"][1]:
-            matches.append(data["label"])
+    matches = [label for label, low, high in COM_BENCHMARKS if low <= abs_shift <= high]
     
     if not matches:
         if abs_shift < 10:
@@ -165,6 +177,10 @@ def get_benchmark_comparison(com_shift_percent):
     
     return f"Typical for: {', '.join(matches)}"
 
+HEAD_STABILITY_NOTES = (
+    "Head stability is crucial for accuracy - a stable head helps maintain consistent release point",
+)
+
 def assess_head_stability(head_data, metadata):
     """
     Generate coaching assessment based on head stability analysis.
@@ -179,8 +195,8 @@ def assess_head_stability(head_data, metadata):
     score = head_data.get("score_0_100", 0.0)
     stance_frame = head_data.get("stance_frame", 0)
     impact_frame = head_data.get("impact_frame", 0)
-    head_x = head_data.get("head_x_smooth", [])
-    head_y = head_data.get("head_y_smooth", [])
+    head_x = np.asarray(head_data.get("head_x_smooth", []), dtype=float)
+    head_y = np.asarray(head_data.get("head_y_smooth", []), dtype=float)
     
     assessment = {
         "overall_rating": "",
@@ -228,8 +244,7 @@ def assess_head_stability(head_data, metadata):
     
     # Analyze vertical movement (head dip)
     if len(head_y) > impact_frame:
-        delivery_y = head_y[stance_frame:impact_frame+1]
-        y_range = max(delivery_y) - min(delivery_y)
+        y_range = np.ptp(head_y[stance_frame:impact_frame+1])
         
         if y_range > 0.05:  # Significant vertical movement
             assessment["areas_for_improvement"].append(
@@ -245,8 +260,7 @@ def assess_head_stability(head_data, metadata):
     
     # Analyze lateral movement
     if len(head_x) > impact_frame:
-        delivery_x = head_x[stance_frame:impact_frame+1]
-        x_range = max(delivery_x) - min(delivery_x)
+        x_range = np.ptp(head_x[stance_frame:impact_frame+1])
         
         if x_range > 0.04:  # Significant lateral movement
             assessment["technical_notes"].append(
@@ -258,9 +272,7 @@ def assess_head_stability(head_data, metadata):
             )
     
     # General coaching notes
-    assessment["technical_notes"].append(
-        "Head stability is crucial for accuracy - a stable head helps maintain consistent release point"
-    )
+    assessment["technical_notes"].extend(HEAD_STABILITY_NOTES)
     
     if score < 70:
         assessment["recommendations"].append(
@@ -269,6 +281,15 @@ def assess_head_stability(head_data, metadata):
     
     return assessment
 
+HEAD_STABILITY_BANDS = ((50, 60, 70, 80, 90), (
+    "Poor stability - significant head movement compromising accuracy and consistency",
+    "Below average stability - noticeable head movement affecting control",
+    "Moderate stability - some head movement that may affect consistency",
+    "Good stability - minor movements that don't significantly affect accuracy",
+    "Excellent stability - head remains very still through delivery",
+    "Elite level head stability - comparable to professional fast bowlers",
+))
+
 def get_head_stability_interpretation(score):
     """
     Get interpretation of head stability score.
@@ -279,18 +300,12 @@ def get_head_stability_interpretation(score):
     Returns:
         String interpretation
     """
-    if score >= 90:
-        return "Elite level head stability - comparable to professional fast bowlers"
-    elif score >= 80:
-        return "Excellent stability - head remains very still through delivery"
-    elif score >= 70:
-        return "Good stability - minor movements that don't significantly affect accuracy"
-    elif score >= 60:
-        return "Moderate stability - some head movement that may affect consistency"
-    elif score >= 50:
-        return "Below average stability - noticeable head movement affecting control"
-    else:
-        return "Poor stability - significant head movement compromising accuracy and consistency"
+    return _interpret(HEAD_STABILITY_BANDS, score, nan_band=0)
+
+HIP_SHOULDER_NOTES = (
+    "Hip-shoulder separation is the 'X-factor' in fast bowling - hips rotate before shoulders",
+    "Greater separation = more elastic energy stored = more ball speed",
+)
 
 def assess_hip_shoulder(hs_data, metadata):
     """
@@ -372,15 +387,18 @@ def assess_hip_shoulder(hs_data, metadata):
         )
     
     # General coaching notes
-    assessment["technical_notes"].append(
-        "Hip-shoulder separation is the 'X-factor' in fast bowling - hips rotate before shoulders"
-    )
-    assessment["technical_notes"].append(
-        "Greater separation = more elastic energy stored = more ball speed"
-    )
+    assessment["technical_notes"].extend(HIP_SHOULDER_NOTES)
     
     return assessment
 
+HIP_SHOULDER_BANDS = ((20, 30, 40, 50), (
+    "Poor separation - significantly restricting power generation",
+    "Moderate separation - limiting potential ball speed",
+    "Good separation - effective but room for improvement",
+    "Excellent separation - strong power generation mechanism",
+    "Elite separation - comparable to international fast bowlers",
+))
+
 def get_hip_shoulder_interpretation(peak_sep):
     """
     Get interpretation of hip-shoulder separation angle.
@@ -391,18 +409,14 @@ def get_hip_shoulder_interpretation(peak_sep):
     Returns:
         String interpretation
     """
-    if peak_sep >= 50:
-        return "Elite separation - comparable to international fast bowlers"
-    elif peak_sep >= 40:
-        return "Excellent separation - strong power generation mechanism"
-    elif peak_sep >= 30:
-        return "Good separation - effective but room for improvement"
-    elif peak_sep >= 20:
-        return "Moderate separation - limiting potential ball speed"
-    else:
-        return "Poor separation - significantly restricting power generation"
+    return _interpret(HIP_SHOULDER_BANDS, peak_sep, nan_band=0)
 
 
+FBR_NOTES = (
+    "FBR measures braking efficiency - lower score indicates better control",
+    "Strong front foot plant is crucial for transferring energy to the ball",
+)
+
 def assess_fbr(fbr_data, metadata):
     """
     Generate coaching assessment based on FBR analysis.
@@ -493,15 +507,18 @@ def assess_fbr(fbr_data, metadata):
         )
     
     # General coaching notes
-    assessment["technical_notes"].append(
-        "FBR measures braking efficiency - lower score indicates better control"
-    )
-    assessment["technical_notes"].append(
-        "Strong front foot plant is crucial for transferring energy to the ball"
-    )
+    assessment["technical_notes"].extend(FBR_NOTES)
     
     return assessment
 
+# Lower FBR is better: COM descent relative to braking force
+FBR_BANDS = ((0.01, 0.02, 0.03), (
+    "Elite braking efficiency - minimal COM descent with strong deceleration",
+    "Good braking efficiency - well-controlled foot plant",
+    "Moderate efficiency - some COM descent indicating room for improvement",
+    "Poor efficiency - excessive COM descent relative to braking force",
+))
+
 def get_fbr_interpretation(fbr_score):
     """
     Get interpretation of FBR score.
@@ -512,16 +529,15 @@ def get_fbr_interpretation(fbr_score):
     Returns:
         String interpretation
     """
-    if fbr_score < 0.01:
-        return "Elite braking efficiency - minimal COM descent with strong deceleration"
-    elif fbr_score < 0.02:
-        return "Good braking efficiency - well-controlled foot plant"
-    elif fbr_score < 0.03:
-        return "Moderate efficiency - some COM descent indicating room for improvement"
-    else:
-        return "Poor efficiency - excessive COM descent relative to braking force"
+    return _interpret(FBR_BANDS, fbr_score)
+
 
 
+KINEMATICS_NOTES = (
+    "Kinematic sequencing follows proximal-to-distal pattern: hips lead, shoulders follow",
+    "Ideal delay between segments: 30ms (0.03 seconds)",
+    "Proper sequencing maximizes energy transfer and ball speed",
+)
 
 def assess_kinematics(kin_data, metadata):
     """
@@ -623,18 +639,18 @@ def assess_kinematics(kin_data, metadata):
         )
     
     # General coaching notes
-    assessment["technical_notes"].append(
-        "Kinematic sequencing follows proximal-to-distal pattern: hips lead, shoulders follow"
-    )
-    assessment["technical_notes"].append(
-        "Ideal delay between segments: 30ms (0.03 seconds)"
-    )
-    assessment["technical_notes"].append(
-        "Proper sequencing maximizes energy transfer and ball speed"
-    )
+    assessment["technical_notes"].extend(KINEMATICS_NOTES)
     
     return assessment
 
+KINEMATICS_BANDS = ((60, 70, 80, 90), (
+    "Poor sequencing - significant coordination problems limiting performance",
+    "Developing - timing issues affecting energy transfer",
+    "Good sequencing - effective but room for refinement",
+    "Excellent sequencing - very good timing between segments",
+    "Elite sequencing - perfect proximal-to-distal coordination",
+))
+
 def get_kinematics_interpretation(score):
     """
     Get interpretation of kinematics score.
@@ -645,16 +661,7 @@ def get_kinematics_interpretation(score):
     Returns:
         String interpretation
     """
-    if score >= 90:
-        return "Elite sequencing - perfect proximal-to-distal coordination"
-    elif score >= 80:
-        return "Excellent sequencing - very good timing between segments"
-    elif score >= 70:
-        return "Good sequencing - effective but room for refinement"
-    elif score >= 60:
-        return "Developing - timing issues affecting energy transfer"
-    else:
-        return "Poor sequencing - significant coordination problems limiting performance"
+    return _interpret(KINEMATICS_BANDS, score, nan_band=0)
 
 
 
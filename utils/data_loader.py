@@ -3,55 +3,155 @@ Data loading utilities with caching for cricket kinematics analysis.
 """
 import streamlit as st
 import json
+import os
+import numpy as np
+from dataclasses import dataclass
 
-@st.cache_data
-def load_analysis_data(json_path):
-    """Load all analysis data from JSON file."""
-    with open(json_path, 'r') as f:
-        return json.load(f)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@st.cache_data
-def load_com_data(json_path):
+def get_mtime(json_path):
+    """File modification time, passed to loaders so edits invalidate the cache."""
+    return os.path.getmtime(json_path)
+
+# json_path -> (mtime, parsed data); one version per file, replaced on change
+_PARSED = {}
+
+def load_analysis_data(json_path, mtime=None):
+    """
+    Load all analysis data from JSON file, parsed once per file version.
+    
+    The parsed tree is held in a module-level dict keyed by path and mtime,
+    so every caller shares one copy and a hit is a plain dict lookup rather
+    than a trip through Streamlit's argument hashing (the section loaders
+    below call this several times per rerun). Callers must treat the result
+    as read-only.
+    """
+    if mtime is None:
+        mtime = get_mtime(json_path)
+    
+    cached = _PARSED.get(json_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    if orjson is not None:
+        with open(json_path, 'rb') as f:
+            raw = f.read()
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity literals json.dump writes
+            data = json.loads(raw)
+    else:
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+    
+    _PARSED[json_path] = (mtime, data)
+    return data
+
+def load_com_data(json_path, mtime=None):
     """Load COM (Center of Mass) analysis data."""
-    data = load_analysis_data(json_path)
+    data = load_analysis_data(json_path, mtime)
     return data.get("center_of_mass", {}).get("com_analysis", {})
 
-@st.cache_data
-def load_pose_data(json_path):
+def load_pose_data(json_path, mtime=None):
     """Load pose landmarks data for all frames."""
-    data = load_analysis_data(json_path)
+    data = load_analysis_data(json_path, mtime)
     return data.get("pose_data", [])
 
-@st.cache_data
-def load_metadata(json_path):
+# MediaPipe Pose landmark count
+NUM_LANDMARKS = 33
+
+# Poses whose mean landmark visibility falls below this are too uncertain to draw
+MIN_POSE_VISIBILITY = 0.3
+
+@dataclass
+class PoseSoA:
+    """
+    Pose landmarks as contiguous per-field arrays (structure of arrays).
+    
+    xs, ys and vis are (frames, landmarks) arrays indexed by frame_idx;
+    frames without a pose are NaN. The default float16 resolves normalized
+    coordinates to ~0.0005 (under half a pixel at 960px), which is all the
+    overlays need; charts of frame-to-frame changes load float32 instead.
+    """
+    xs: np.ndarray
+    ys: np.ndarray
+    vis: np.ndarray
+    
+    def __len__(self):
+        return len(self.xs)
+    
+    @property
+    def has_pose(self):
+        """(frames,) bool mask of frames with a detected pose."""
+        return ~np.isnan(self.xs).any(axis=1)
+    
+    def confident_pose(self, min_visibility=MIN_POSE_VISIBILITY):
+        """
+        (frames,) bool mask of frames with a pose reliable enough to draw.
+        
+        A detected pose is skipped when its mean landmark visibility is below
+        min_visibility; landmarks without a visibility score count as visible.
+        """
+        vis = np.nan_to_num(self.vis.astype(np.float32), nan=1.0)
+        return self.has_pose & (vis.mean(axis=1) >= min_visibility)
+    
+    def to_pixels(self, width, height):
+        """All landmarks as (frames, landmarks, 2) int16 pixel coordinates (0 where no pose)."""
+        xy = np.nan_to_num(np.stack((self.xs, self.ys), axis=-1).astype(np.float32))
+        xy *= np.array([width, height], dtype=np.float32)
+        return xy.astype(np.int16)
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_pose_soa(json_path, mtime=None, dtype="float16"):
+    """
+    Load pose landmarks once as a PoseSoA instead of per-landmark dicts.
+    
+    The arrays are shared by every caller (no per-call copy) and marked
+    read-only so a consumer cannot alter them for everyone else.
+    """
+    pose_data = load_pose_data(json_path, mtime)
+    num_frames = max((item['frame_idx'] for item in pose_data), default=-1) + 1
+    
+    fields = np.full((3, num_frames, NUM_LANDMARKS), np.nan, dtype=dtype)
+    for item in pose_data:
+        landmarks = item.get('landmarks')
+        if landmarks:
+            landmarks = landmarks[:NUM_LANDMARKS]
+            fields[:, item['frame_idx'], :len(landmarks)] = np.array(
+                [(lm['x'], lm['y'], lm.get('visibility', np.nan)) for lm in landmarks]
+            ).T
+    fields.setflags(write=False)
+    return PoseSoA(*fields)
+
+def load_metadata(json_path, mtime=None):
     """Load video metadata (fps, dimensions, etc.)."""
-    data = load_analysis_data(json_path)
+    data = load_analysis_data(json_path, mtime)
     return data.get("metadata", {})
 
-@st.cache_data
-def load_kinematics_data(json_path):
+def load_kinematics_data(json_path, mtime=None):
     """Load kinematics analysis data."""
-    data = load_analysis_data(json_path)
+    data = load_analysis_data(json_path, mtime)
     return data.get("kinematics", {})
 
-@st.cache_data
-def load_hip_shoulder_data(json_path):
+def load_hip_shoulder_data(json_path, mtime=None):
     """Load hip-shoulder analysis data."""
-    data = load_analysis_data(json_path)
+    data = load_analysis_data(json_path, mtime)
     return data.get("hip_shoulder", {})
 
-@st.cache_data
-def load_head_stability_data(json_path):
+def load_head_stability_data(json_path, mtime=None):
     """Load head stability analysis data."""
-    data = load_analysis_data(json_path)
+    data = load_analysis_data(json_path, mtime)
     head_data = data.get("head_stability", {})
     # Handle nested structure
     if "head_stability" in head_data:
         return head_data.get("head_stability", {})
     return head_data
 
-@st.cache_data
-def load_fbr_data(json_path):
+def load_fbr_data(json_path, mtime=None):
     """Load FBR (Front-Back-Release) analysis data."""
-    data = load_analysis_data(json_path)
+    data = load_analysis_data(json_path, mtime)
     return data.get("foot_plant_fbr", {})
@@ -3,15 +3,15 @@ Video processing for FBR visualization.
 """
 import cv2
 import numpy as np
-from utils.pose_drawing import draw_pose_on_frame
+from utils.pose_drawing import draw_pose_points
 
-def draw_fbr_overlay(frame, landmarks, width, height, frame_idx, plant_frame, lowest_frame, com_y):
+def draw_fbr_overlay(frame, points, width, height, frame_idx, plant_frame, lowest_frame, com_y):
     """
     Draw FBR overlay on frame.
     
     Args:
         frame: Video frame
-        landmarks: Pose landmarks
+        points: Landmark pixel coordinates, (x, y) per landmark
         width: Frame width
         height: Frame height
         frame_idx: Current frame index
@@ -26,12 +26,12 @@ def draw_fbr_overlay(frame, landmarks, width, height, frame_idx, plant_frame, lo
     L_ANKLE = 27
     R_ANKLE = 28
     
-    if len(landmarks) <= max(L_ANKLE, R_ANKLE):
+    if len(points) <= max(L_ANKLE, R_ANKLE):
         return frame
     
     # Draw ankle markers
-    l_ankle = (int(landmarks[L_ANKLE]['x'] * width), int(landmarks[L_ANKLE]['y'] * height))
-    r_ankle = (int(landmarks[R_ANKLE]['x'] * width), int(landmarks[R_ANKLE]['y'] * height))
+    l_ankle = tuple(points[L_ANKLE])
+    r_ankle = tuple(points[R_ANKLE])
     
     # Color based on phase
     if frame_idx < plant_frame:
@@ -73,33 +73,37 @@ def draw_fbr_overlay(frame, landmarks, width, height, frame_idx, plant_frame, lo
     
     return frame
 
-def process_video_with_fbr(video_path, pose_data, fbr_data, metadata, output_path):
+def process_video_with_fbr(video_path, pose, fbr_data, metadata, output_path,
+                           sample_stride=1, render_scale=1.0):
     """
     Process video with FBR overlay.
     
     Args:
         video_path: Input video path
-        pose_data: List of pose data for each frame
+        pose: PoseSoA from load_pose_soa
         fbr_data: FBR analysis data
         metadata: Video metadata
         output_path: Output video path
+        sample_stride: Decode every Nth source frame (see compute_sample_stride)
+        render_scale: Scale factor applied to frames before drawing and encoding
     
     Returns:
         Output video path or None if failed
     """
-    cap = cv2.VideoCapture(video_path)
+    from utils.video_processor import acquire_capture, release_capture, create_video_writer, close_video_writer, iter_video_frames
+    
+    cap = acquire_capture(video_path)
     if not cap.isOpened():
         return None
     
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) * render_scale)
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) * render_scale)
+    fps = cap.get(cv2.CAP_PROP_FPS) / sample_stride
     
     # Create video writer using automatic codec detection for web compatibility
-    from utils.video_processor import create_video_writer
     out, final_output_path = create_video_writer(output_path, width, height, int(fps) if fps else 24)
     if out is None:
-        cap.release()
+        release_capture(video_path, cap)
         print("ERROR: Cannot create video writer")
         return None
     
@@ -108,31 +112,32 @@ def process_video_with_fbr(video_path, pose_data, fbr_data, metadata, output_pat
     plant_frame = fbr_data.get("plant_frame", 0)
     lowest_frame = fbr_data.get("lowest_com_frame", 0)
     
-    # Create pose map
-    pose_map = {item['frame_idx']: item['landmarks'] for item in pose_data if item.get('landmarks')}
-    
-    frame_idx = 0
-    
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Draw pose if available
-        landmarks = pose_map.get(frame_idx)
-        if landmarks:
-            frame = draw_pose_on_frame(frame, landmarks, width, height)
+    # Landmark pixel coordinates for every frame, converted in one pass;
+    # low-confidence poses are left undrawn along with their overlays
+    pose_px = pose.to_pixels(width, height)
+    has_pose = pose.confident_pose()
+    
+    try:
+        # Analysis frame index counts sampled frames, not source frames
+        frames = iter_video_frames(video_path, cap, sample_stride, size=(width, height))
+        for frame_idx, frame in enumerate(frames):
+            # Draw pose if available
+            if frame_idx < len(has_pose) and has_pose[frame_idx]:
+                points = pose_px[frame_idx].tolist()
+                frame = draw_pose_points(frame, points)
+                
+                # Draw FBR overlay
+                if frame_idx < len(com_y_series):
+                    com_y = com_y_series[frame_idx]
+                    frame = draw_fbr_overlay(frame, points, width, height, 
+                                            frame_idx, plant_frame, lowest_frame, com_y)
             
-            # Draw FBR overlay
-            if frame_idx < len(com_y_series):
-                com_y = com_y_series[frame_idx]
-                frame = draw_fbr_overlay(frame, landmarks, width, height, 
-                                        frame_idx, plant_frame, lowest_frame, com_y)
-        
-        out.write(frame)
-        frame_idx += 1
-    
-    cap.release()
-    out.release()
+            out.write(frame)
+    finally:
+        release_capture(video_path, cap)
+        encoded = close_video_writer(out)
+    
+    if not encoded:
+        return None
     
     return final_output_path
@@ -0,0 +1,94 @@
+"""
+Figure caching for the analysis pages.
+Keeps built Plotly figures alive across Streamlit reruns.
+"""
+import importlib
+import numpy as np
+import streamlit as st
+
+# Line traces longer than this are reduced to per-bucket min/max points before
+# they reach the browser; a chart is only ever a few thousand pixels wide
+MAX_LINE_POINTS = 2000
+
+# Per-point trace properties that must be sliced along with x and y
+POINT_ATTRS = ("x", "y", "text", "hovertext", "customdata")
+MARKER_POINT_ATTRS = ("color", "size", "symbol")
+
+def _minmax_indices(y, max_points):
+    """
+    Indices of the min and max point in each of max_points/2 equal buckets.
+
+    Keeping both extremes per bucket preserves peaks and troughs (e.g. the
+    peak separation frame) that plain striding would drop.
+    """
+    n = len(y)
+    num_buckets = max_points // 2
+    bucket = -(-n // num_buckets)
+
+    lo = np.full(num_buckets * bucket, np.inf)
+    hi = np.full(num_buckets * bucket, -np.inf)
+    valid = ~np.isnan(y)
+    lo[:n] = np.where(valid, y, np.inf)
+    hi[:n] = np.where(valid, y, -np.inf)
+
+    offsets = np.arange(num_buckets) * bucket
+    idx = np.concatenate((
+        lo.reshape(num_buckets, bucket).argmin(axis=1) + offsets,
+        hi.reshape(num_buckets, bucket).argmax(axis=1) + offsets,
+        [0, n - 1],
+    ))
+    return np.unique(idx[idx < n])
+
+def _downsample_lines(fig, max_points=MAX_LINE_POINTS):
+    """Reduce long line traces in place to at most ~max_points points each."""
+    for trace in fig.data:
+        if trace.type not in ("scatter", "scattergl") or "lines" not in (trace.mode or "lines"):
+            continue
+        if trace.y is None or len(trace.y) <= max_points:
+            continue
+
+        try:
+            y = np.asarray(trace.y, dtype=float)
+        except (TypeError, ValueError):
+            continue  # categorical y
+        n = len(y)
+        idx = _minmax_indices(y, max_points)
+
+        if trace.x is None:
+            # Implicit x is the point index; make it explicit before slicing
+            trace.x = np.arange(n)
+        for attr in POINT_ATTRS:
+            value = getattr(trace, attr)
+            if isinstance(value, (list, tuple, np.ndarray)) and len(value) == n:
+                setattr(trace, attr, np.asarray(value)[idx])
+        for attr in MARKER_POINT_ATTRS:
+            value = getattr(trace.marker, attr)
+            if isinstance(value, (list, tuple, np.ndarray)) and len(value) == n:
+                setattr(trace.marker, attr, np.asarray(value)[idx])
+    return fig
+
+# Room for every view of every page (57) for one version of the data;
+# figures for superseded versions are evicted as new ones are built
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _build_figure(module_name, func_name, data_key, _args):
+    """Build a figure once per (plot function, data_key); _args is not hashed."""
+    module = importlib.import_module(module_name)
+    return _downsample_lines(getattr(module, func_name)(*_args))
+
+def cached_plot(plot_fn, data_key, *args):
+    """
+    Return the figure for plot_fn(*args), building it only on a cache miss.
+
+    Long line traces are downsampled once at build time (see MAX_LINE_POINTS),
+    so reruns never re-send thousands of points the chart cannot show.
+
+    Args:
+        plot_fn: Plot function from the visualizations package
+        data_key: Hashable key identifying the input data, e.g. (json_path, mtime);
+            it must tell apart every input, since args are not hashed
+        *args: Arguments passed through to plot_fn
+
+    Returns:
+        Plotly figure (shared between reruns - do not mutate)
+    """
+    return _build_figure(plot_fn.__module__, plot_fn.__name__, data_key, args)
@@ -3,36 +3,41 @@ Video processing utilities for head stability visualization.
 """
 import cv2
 import numpy as np
-from utils.pose_drawing import draw_pose_on_frame
+from collections import deque
+from utils.pose_drawing import draw_pose_points
 from visualizations.head_viz import draw_head_on_frame
 
-def process_video_with_head_tracking(video_path, pose_data, head_data, metadata, output_path):
+def process_video_with_head_tracking(video_path, pose, head_data, metadata, output_path,
+                                     sample_stride=1, render_scale=1.0):
     """
     Process video with pose annotations and head tracking overlay.
     
     Args:
         video_path: Input video path
-        pose_data: List of pose data for each frame
+        pose: PoseSoA from load_pose_soa
         head_data: Head stability data
         metadata: Video metadata
         output_path: Output video path
+        sample_stride: Decode every Nth source frame (see compute_sample_stride)
+        render_scale: Scale factor applied to frames before drawing and encoding
     
     Returns:
         Output video path or None if failed
     """
-    cap = cv2.VideoCapture(video_path)
+    from utils.video_processor import acquire_capture, release_capture, create_video_writer, close_video_writer, iter_video_frames
+    
+    cap = acquire_capture(video_path)
     if not cap.isOpened():
         return None
     
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) * render_scale)
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) * render_scale)
+    fps = cap.get(cv2.CAP_PROP_FPS) / sample_stride
     
     # Create video writer using automatic codec detection for web compatibility
-    from utils.video_processor import create_video_writer
     out, final_output_path = create_video_writer(output_path, width, height, int(fps) if fps else 24)
     if out is None:
-        cap.release()
+        release_capture(video_path, cap)
         print("ERROR: Cannot create video writer")
         return None
     
@@ -59,53 +64,50 @@ def process_video_with_head_tracking(video_path, pose_data, head_data, metadata,
         # Resize to full frame size
         heatmap_resized = cv2.resize(hist, (width, height), interpolation=cv2.INTER_LINEAR)
         
-        # Apply colormap
-        heatmap_colored = cv2.applyColorMap(heatmap_resized, cv2.COLORMAP_JET)
-        
-        # Make it semi-transparent by creating alpha channel
-        heatmap_overlay = heatmap_colored.copy()
+        # Apply colormap (blended at 30% opacity in the frame loop)
+        heatmap_overlay = cv2.applyColorMap(heatmap_resized, cv2.COLORMAP_JET)
     
-    # Create pose map
-    pose_map = {item['frame_idx']: item['landmarks'] for item in pose_data if item.get('landmarks')}
+    # Landmark pixel coordinates for every frame, converted in one pass;
+    # low-confidence poses are left undrawn
+    pose_px = pose.to_pixels(width, height)
+    has_pose = pose.confident_pose()
     
-    frame_idx = 0
-    head_trail = []
+    # Rolling trail; the deque drops the oldest point once it is full
     trail_length = 20
+    head_trail = deque(maxlen=trail_length)
     
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Draw pose if available
-        landmarks = pose_map.get(frame_idx)
-        if landmarks:
-            frame = draw_pose_on_frame(frame, landmarks, width, height)
-        
-        # Overlay heatmap with transparency
-        if heatmap_overlay is not None:
-            frame = cv2.addWeighted(frame, 0.7, heatmap_overlay, 0.3, 0)
-        
-        # Draw head tracking if available
-        if frame_idx < len(head_x_series) and frame_idx < len(head_y_series):
-            head_x = head_x_series[frame_idx]
-            head_y = head_y_series[frame_idx]
+    try:
+        # Analysis frame index counts sampled frames, not source frames
+        frames = iter_video_frames(video_path, cap, sample_stride, size=(width, height))
+        for frame_idx, frame in enumerate(frames):
+            # Draw pose if available
+            if frame_idx < len(has_pose) and has_pose[frame_idx]:
+                frame = draw_pose_points(frame, pose_px[frame_idx].tolist())
             
-            # Update trail
-            head_trail.append((head_x, head_y))
-            if len(head_trail) > trail_length:
-                head_trail.pop(0)
+            # Overlay heatmap with transparency, blended in place into the frame
+            if heatmap_overlay is not None:
+                cv2.addWeighted(frame, 0.7, heatmap_overlay, 0.3, 0, dst=frame)
             
-            frame = draw_head_on_frame(
-                frame, head_x, head_y, frame_idx, 
-                stance_frame, impact_frame, 
-                head_trail, width, height
-            )
-        
-        out.write(frame)
-        frame_idx += 1
+            # Draw head tracking if available
+            if frame_idx < len(head_x_series) and frame_idx < len(head_y_series):
+                head_x = head_x_series[frame_idx]
+                head_y = head_y_series[frame_idx]
+                
+                # Update trail
+                head_trail.append((head_x, head_y))
+                
+                frame = draw_head_on_frame(
+                    frame, head_x, head_y, frame_idx, 
+                    stance_frame, impact_frame, 
+                    head_trail, width, height
+                )
+            
+            out.write(frame)
+    finally:
+        release_capture(video_path, cap)
+        encoded = close_video_writer(out)
     
-    cap.release()
-    out.release()
+    if not encoded:
+        return None
     
     return final_output_path
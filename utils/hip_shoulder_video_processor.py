@@ -3,15 +3,15 @@ Video processing for hip-shoulder separation visualization.
 """
 import cv2
 import numpy as np
-from utils.pose_drawing import draw_pose_on_frame
+from utils.pose_drawing import draw_pose_points
 
-def draw_hip_shoulder_lines(frame, landmarks, width, height, angle, is_peak=False):
+def draw_hip_shoulder_lines(frame, points, width, height, angle, is_peak=False):
     """
     Draw hip and shoulder lines with separation angle.
     
     Args:
         frame: Video frame
-        landmarks: Pose landmarks
+        points: Landmark pixel coordinates, (x, y) per landmark
         width: Frame width
         height: Frame height
         angle: Current separation angle
@@ -26,14 +26,14 @@ def draw_hip_shoulder_lines(frame, landmarks, width, height, angle, is_peak=Fals
     L_HIP = 23
     R_HIP = 24
     
-    if len(landmarks) <= max(L_SHOULDER, R_SHOULDER, L_HIP, R_HIP):
+    if len(points) <= max(L_SHOULDER, R_SHOULDER, L_HIP, R_HIP):
         return frame
     
-    # Convert to pixel coordinates
-    l_sh = (int(landmarks[L_SHOULDER]['x'] * width), int(landmarks[L_SHOULDER]['y'] * height))
-    r_sh = (int(landmarks[R_SHOULDER]['x'] * width), int(landmarks[R_SHOULDER]['y'] * height))
-    l_hp = (int(landmarks[L_HIP]['x'] * width), int(landmarks[L_HIP]['y'] * height))
-    r_hp = (int(landmarks[R_HIP]['x'] * width), int(landmarks[R_HIP]['y'] * height))
+    # Pixel positions
+    l_sh = tuple(points[L_SHOULDER])
+    r_sh = tuple(points[R_SHOULDER])
+    l_hp = tuple(points[L_HIP])
+    r_hp = tuple(points[R_HIP])
     
     # Color based on whether it's peak frame
     hip_color = (0, 255, 0) if is_peak else (255, 165, 0)  # Green at peak, orange otherwise
@@ -73,33 +73,37 @@ def draw_hip_shoulder_lines(frame, landmarks, width, height, angle, is_peak=Fals
     
     return frame
 
-def process_video_with_hip_shoulder(video_path, pose_data, hs_data, metadata, output_path):
+def process_video_with_hip_shoulder(video_path, pose, hs_data, metadata, output_path,
+                                    sample_stride=1, render_scale=1.0):
     """
     Process video with hip-shoulder separation overlay.
     
     Args:
         video_path: Input video path
-        pose_data: List of pose data for each frame
+        pose: PoseSoA from load_pose_soa
         hs_data: Hip-shoulder analysis data
         metadata: Video metadata
         output_path: Output video path
+        sample_stride: Decode every Nth source frame (see compute_sample_stride)
+        render_scale: Scale factor applied to frames before drawing and encoding
     
     Returns:
         Output video path or None if failed
     """
-    cap = cv2.VideoCapture(video_path)
+    from utils.video_processor import acquire_capture, release_capture, create_video_writer, close_video_writer, iter_video_frames
+    
+    cap = acquire_capture(video_path)
     if not cap.isOpened():
         return None
     
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) * render_scale)
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) * render_scale)
+    fps = cap.get(cv2.CAP_PROP_FPS) / sample_stride
     
     # Create video writer using automatic codec detection for web compatibility
-    from utils.video_processor import create_video_writer
     out, final_output_path = create_video_writer(output_path, width, height, int(fps) if fps else 24)
     if out is None:
-        cap.release()
+        release_capture(video_path, cap)
         print("ERROR: Cannot create video writer")
         return None
     
@@ -110,36 +114,37 @@ def process_video_with_hip_shoulder(video_path, pose_data, hs_data, metadata, ou
     downswing_start = key_frames.get("downswing_start", 0)
     downswing_end = key_frames.get("downswing_end", 0)
     
-    # Create pose map
-    pose_map = {item['frame_idx']: item['landmarks'] for item in pose_data if item.get('landmarks')}
-    
-    frame_idx = 0
-    
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Draw pose if available
-        landmarks = pose_map.get(frame_idx)
-        if landmarks:
-            frame = draw_pose_on_frame(frame, landmarks, width, height)
+    # Landmark pixel coordinates for every frame, converted in one pass;
+    # low-confidence poses are left undrawn along with their overlays
+    pose_px = pose.to_pixels(width, height)
+    has_pose = pose.confident_pose()
+    
+    try:
+        # Analysis frame index counts sampled frames, not source frames
+        frames = iter_video_frames(video_path, cap, sample_stride, size=(width, height))
+        for frame_idx, frame in enumerate(frames):
+            # Draw pose if available
+            if frame_idx < len(has_pose) and has_pose[frame_idx]:
+                points = pose_px[frame_idx].tolist()
+                frame = draw_pose_points(frame, points)
+                
+                # Draw hip-shoulder lines if we have angle data
+                if frame_idx < len(angle_series):
+                    angle = angle_series[frame_idx]
+                    is_peak = (frame_idx == peak_frame)
+                    frame = draw_hip_shoulder_lines(frame, points, width, height, angle, is_peak)
             
-            # Draw hip-shoulder lines if we have angle data
-            if frame_idx < len(angle_series):
-                angle = angle_series[frame_idx]
-                is_peak = (frame_idx == peak_frame)
-                frame = draw_hip_shoulder_lines(frame, landmarks, width, height, angle, is_peak)
-        
-        # Add phase indicator
-        if downswing_start <= frame_idx <= downswing_end:
-            cv2.putText(frame, "DOWNSWING", (10, height - 20), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-        
-        out.write(frame)
-        frame_idx += 1
-    
-    cap.release()
-    out.release()
+            # Add phase indicator
+            if downswing_start <= frame_idx <= downswing_end:
+                cv2.putText(frame, "DOWNSWING", (10, height - 20), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            
+            out.write(frame)
+    finally:
+        release_capture(video_path, cap)
+        encoded = close_video_writer(out)
+    
+    if not encoded:
+        return None
     
     return final_output_path
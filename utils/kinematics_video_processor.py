@@ -4,16 +4,16 @@ Shows hip, torso, and shoulder lines with rotation indicators.
 """
 import cv2
 import numpy as np
-from utils.pose_drawing import draw_pose_on_frame
+from utils.pose_drawing import draw_pose_points
 
-def draw_kinematics_overlay(frame, landmarks, width, height, frame_idx, 
+def draw_kinematics_overlay(frame, points, width, height, frame_idx, 
                             hip_frame, torso_frame, shoulder_frame):
     """
     Draw kinematics overlay showing hip, torso, and shoulder lines.
     
     Args:
         frame: Video frame
-        landmarks: Pose landmarks
+        points: Landmark pixel coordinates, (x, y) per landmark
         width: Frame width
         height: Frame height
         frame_idx: Current frame index
@@ -30,14 +30,14 @@ def draw_kinematics_overlay(frame, landmarks, width, height, frame_idx,
     L_SHOULDER = 11
     R_SHOULDER = 12
     
-    if len(landmarks) <= max(L_HIP, R_HIP, L_SHOULDER, R_SHOULDER):
+    if len(points) <= max(L_HIP, R_HIP, L_SHOULDER, R_SHOULDER):
         return frame
     
     # Get positions
-    l_hip = (int(landmarks[L_HIP]['x'] * width), int(landmarks[L_HIP]['y'] * height))
-    r_hip = (int(landmarks[R_HIP]['x'] * width), int(landmarks[R_HIP]['y'] * height))
-    l_sh = (int(landmarks[L_SHOULDER]['x'] * width), int(landmarks[L_SHOULDER]['y'] * height))
-    r_sh = (int(landmarks[R_SHOULDER]['x'] * width), int(landmarks[R_SHOULDER]['y'] * height))
+    l_hip = tuple(points[L_HIP])
+    r_hip = tuple(points[R_HIP])
+    l_sh = tuple(points[L_SHOULDER])
+    r_sh = tuple(points[R_SHOULDER])
     
     # Calculate midpoints
     hip_mid = ((l_hip[0] + r_hip[0]) // 2, (l_hip[1] + r_hip[1]) // 2)
@@ -106,33 +106,37 @@ def draw_kinematics_overlay(frame, landmarks, width, height, frame_idx,
     
     return frame
 
-def process_video_with_kinematics(video_path, pose_data, kin_data, metadata, output_path):
+def process_video_with_kinematics(video_path, pose, kin_data, metadata, output_path,
+                                  sample_stride=1, render_scale=1.0):
     """
     Process video with kinematics overlay.
     
     Args:
         video_path: Input video path
-        pose_data: List of pose data for each frame
+        pose: PoseSoA from load_pose_soa
         kin_data: Kinematics analysis data
         metadata: Video metadata
         output_path: Output video path
+        sample_stride: Decode every Nth source frame (see compute_sample_stride)
+        render_scale: Scale factor applied to frames before drawing and encoding
     
     Returns:
         Output video path or None if failed
     """
-    cap = cv2.VideoCapture(video_path)
+    from utils.video_processor import acquire_capture, release_capture, create_video_writer, close_video_writer, iter_video_frames
+    
+    cap = acquire_capture(video_path)
     if not cap.isOpened():
         return None
     
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) * render_scale)
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) * render_scale)
+    fps = cap.get(cv2.CAP_PROP_FPS) / sample_stride
     
     # Create video writer using automatic codec detection for web compatibility
-    from utils.video_processor import create_video_writer
     out, final_output_path = create_video_writer(output_path, width, height, int(fps) if fps else 24)
     if out is None:
-        cap.release()
+        release_capture(video_path, cap)
         print("ERROR: Cannot create video writer")
         return None
     
@@ -142,29 +146,30 @@ def process_video_with_kinematics(video_path, pose_data, kin_data, metadata, out
     torso_frame = peaks.get("torso_frame", 0)
     shoulder_frame = peaks.get("shoulder_frame", 0)
     
-    # Create pose map
-    pose_map = {item['frame_idx']: item['landmarks'] for item in pose_data if item.get('landmarks')}
-    
-    frame_idx = 0
-    
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Draw pose if available
-        landmarks = pose_map.get(frame_idx)
-        if landmarks:
-            frame = draw_pose_on_frame(frame, landmarks, width, height)
+    # Landmark pixel coordinates for every frame, converted in one pass;
+    # low-confidence poses are left undrawn along with their overlays
+    pose_px = pose.to_pixels(width, height)
+    has_pose = pose.confident_pose()
+    
+    try:
+        # Analysis frame index counts sampled frames, not source frames
+        frames = iter_video_frames(video_path, cap, sample_stride, size=(width, height))
+        for frame_idx, frame in enumerate(frames):
+            # Draw pose if available
+            if frame_idx < len(has_pose) and has_pose[frame_idx]:
+                points = pose_px[frame_idx].tolist()
+                frame = draw_pose_points(frame, points)
+                
+                # Draw kinematics overlay
+                frame = draw_kinematics_overlay(frame, points, width, height, 
+                                               frame_idx, hip_frame, torso_frame, shoulder_frame)
             
-            # Draw kinematics overlay
-            frame = draw_kinematics_overlay(frame, landmarks, width, height, 
-                                           frame_idx, hip_frame, torso_frame, shoulder_frame)
-        
-        out.write(frame)
-        frame_idx += 1
-    
-    cap.release()
-    out.release()
+            out.write(frame)
+    finally:
+        release_capture(video_path, cap)
+        encoded = close_video_writer(out)
+    
+    if not encoded:
+        return None
     
     return final_output_path
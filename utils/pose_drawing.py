@@ -3,6 +3,8 @@ Pose drawing utilities for cricket kinematics visualization.
 Moved from st_app.py for modularity.
 """
 import cv2
+import numpy as np
+from functools import lru_cache
 
 # MediaPipe Pose landmark indices
 # Head/Face: 0-10
@@ -56,6 +58,40 @@ def get_landmark_color(idx):
     else:
         return COLORS['legs']
 
+# Per-landmark colors, resolved once instead of on every frame
+LANDMARK_COLORS = [get_landmark_color(idx) for idx in range(33)]
+LANDMARK_COLOR_ARRAY = np.array(LANDMARK_COLORS, dtype=np.uint8)
+
+# Landmark dot radius and the (row, col) offsets of the pixels cv2.circle
+# fills for it, rasterised once so every dot can be written in one scatter
+LANDMARK_RADIUS = 5
+_dot = np.zeros((2 * LANDMARK_RADIUS + 1,) * 2, dtype=np.uint8)
+cv2.circle(_dot, (LANDMARK_RADIUS, LANDMARK_RADIUS), LANDMARK_RADIUS, 1, -1)
+LANDMARK_DOT_OFFSETS = np.argwhere(_dot) - LANDMARK_RADIUS
+del _dot
+
+# Per-pixel dot colors for a full 33-landmark pose, in scatter order
+LANDMARK_DOT_COLORS = np.repeat(LANDMARK_COLOR_ARRAY, len(LANDMARK_DOT_OFFSETS), axis=0)
+
+def landmarks_to_pixels(landmarks, width, height):
+    """
+    Convert normalized landmarks to integer pixel coordinates in one pass.
+    
+    Args:
+        landmarks: List of landmark dicts with 'x', 'y'
+        width: Frame width in pixels
+        height: Frame height in pixels
+    
+    Returns:
+        List of (x, y) int tuples, one per landmark
+    """
+    xy = np.fromiter(
+        (v for lm in landmarks for v in (lm['x'], lm['y'])),
+        dtype=np.float64, count=2 * len(landmarks)
+    ).reshape(-1, 2)
+    xy *= (width, height)
+    return [tuple(pt) for pt in xy.astype(np.int32).tolist()]
+
 def draw_pose_on_frame(frame, landmarks, width, height):
     """
     Draws pose landmarks and connections on the frame with color-coded body parts.
@@ -70,18 +106,93 @@ def draw_pose_on_frame(frame, landmarks, width, height):
         Modified frame with pose overlay
     """
     # Convert to pixel coordinates
-    points = {}
-    for idx, lm in enumerate(landmarks):
-        cx, cy = int(lm['x'] * width), int(lm['y'] * height)
-        points[idx] = (cx, cy)
-        # Draw landmarks with color based on body part
-        color = get_landmark_color(idx)
-        cv2.circle(frame, (cx, cy), 5, color, -1)
-            
+    return draw_pose_points(frame, landmarks_to_pixels(landmarks, width, height))
+
+def draw_pose_points(frame, points):
+    """
+    Draw the colour-coded skeleton from landmark pixel coordinates.
+    
+    Args:
+        frame: Video frame (numpy array)
+        points: Sequence of (x, y) int pairs, one per landmark
+    
+    Returns:
+        Modified frame with pose overlay
+    """
+    # Draw all landmark dots with one scatter, colored by body part
+    pts = np.asarray(points, dtype=np.intp).reshape(-1, 2)
+    num_points = len(pts)
+    if num_points <= len(LANDMARK_COLOR_ARRAY):
+        colors = LANDMARK_DOT_COLORS[:num_points * len(LANDMARK_DOT_OFFSETS)]
+    else:
+        colors = np.repeat(
+            np.array([get_landmark_color(idx) for idx in range(num_points)], dtype=np.uint8),
+            len(LANDMARK_DOT_OFFSETS), axis=0
+        )
+    
+    rows = (pts[:, 1, None] + LANDMARK_DOT_OFFSETS[:, 0]).ravel()
+    cols = (pts[:, 0, None] + LANDMARK_DOT_OFFSETS[:, 1]).ravel()
+    height, width = frame.shape[:2]
+    if rows.min(initial=0) >= 0 and cols.min(initial=0) >= 0 and \
+            rows.max(initial=0) < height and cols.max(initial=0) < width:
+        frame[rows, cols] = colors
+    else:
+        # Clip dots that fall partly outside the frame
+        inside = (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+        frame[rows[inside], cols[inside]] = colors[inside]
+    
     # Draw connections with color based on body part
     for (start_idx, end_idx), body_part in POSE_CONNECTIONS:
-        if start_idx in points and end_idx in points:
+        if start_idx < num_points and end_idx < num_points:
             color = COLORS[body_part]
             cv2.line(frame, points[start_idx], points[end_idx], color, 3)
 
     return frame
+
+@lru_cache(maxsize=None)
+def marker_stamp(color, radius, ring_radius, crosshair=0):
+    """
+    Pre-render a position marker (optional crosshair, filled dot, white ring).
+    
+    Drawing the marker once into a small patch lets each frame paste it with
+    a masked copy instead of repeating the cv2 primitives.
+    
+    Args:
+        color: BGR colour of the crosshair and dot
+        radius: Radius of the filled dot
+        ring_radius: Radius of the 2px white ring
+        crosshair: Half-length of the 2px crosshair lines (0 = none)
+    
+    Returns:
+        tuple: (patch, mask) arrays centred on the marker
+    """
+    r = max(ring_radius, crosshair) + 2
+    patch = np.zeros((2 * r + 1, 2 * r + 1, 3), dtype=np.uint8)
+    mask = np.zeros((2 * r + 1, 2 * r + 1), dtype=np.uint8)
+    
+    for img, c, ring_c in ((patch, color, (255, 255, 255)), (mask, 255, 255)):
+        if crosshair:
+            cv2.line(img, (r - crosshair, r), (r + crosshair, r), c, 2)
+            cv2.line(img, (r, r - crosshair), (r, r + crosshair), c, 2)
+        cv2.circle(img, (r, r), radius, c, -1)
+        cv2.circle(img, (r, r), ring_radius, ring_c, 2)
+    
+    return patch, mask.astype(bool)
+
+def blit_stamp(frame, stamp, center):
+    """Paste a marker_stamp onto frame in place, centred at center and clipped to the frame."""
+    patch, mask = stamp
+    r = patch.shape[0] // 2
+    x, y = center
+    height, width = frame.shape[:2]
+    
+    x0, y0 = max(x - r, 0), max(y - r, 0)
+    x1, y1 = min(x + r + 1, width), min(y + r + 1, height)
+    if x0 >= x1 or y0 >= y1:
+        return frame
+    
+    px0, py0 = x0 - (x - r), y0 - (y - r)
+    px1, py1 = px0 + (x1 - x0), py0 + (y1 - y0)
+    np.copyto(frame[y0:y1, x0:x1], patch[py0:py1, px0:px1],
+              where=mask[py0:py1, px0:px1, None])
+    return frame
@@ -0,0 +1,198 @@
+"""
+Overlay video caching for the analysis pages.
+Keeps rendered overlay videos across reruns, sessions and app restarts.
+"""
+import glob
+import hashlib
+import importlib
+import os
+import shutil
+import tempfile
+import streamlit as st
+from utils.video_processor import overlay_output_path, discard_outputs
+
+# Finished renders live on disk; only the scratch encode goes to tmpfs
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "instilplay_viz", "overlays"
+)
+# Total size of cached renders; the least recently used are removed beyond it
+MAX_CACHE_BYTES = 1 << 30
+
+VIDEO_FORMATS = {'.mp4': 'video/mp4', '.webm': 'video/webm', '.avi': 'video/x-msvideo'}
+VIDEO_EXTENSIONS = {mime: ext for ext, mime in VIDEO_FORMATS.items()}
+
+class VideoRenderError(Exception):
+    """Raised when an overlay render fails, so the failure is not cached."""
+
+def _digest(key):
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+def _cached_output_prefix(module_name, func_name, video_path, options):
+    """Path prefix shared by every render of one video with one processor variant."""
+    variant = _digest(f'{module_name}|{options}')
+    return os.path.join(CACHE_DIR, f"overlay_{func_name}_{variant}_{_digest(os.path.abspath(video_path))}_")
+
+def _cached_output_base(module_name, func_name, video_path, video_mtime, data_key, options):
+    """Deterministic output path (without extension) for one render's inputs."""
+    prefix = _cached_output_prefix(module_name, func_name, video_path, options)
+    return prefix + _digest(f"{video_mtime}|{data_key}")
+
+def _find_cached_output(base):
+    """Return the finished render for base, whichever container the writer picked."""
+    for ext in VIDEO_FORMATS:
+        if os.path.exists(base + ext):
+            # Refresh its mtime, which _trim_cache uses as the last-used time
+            try:
+                os.utime(base + ext)
+            except OSError:
+                pass
+            return base + ext
+    return None
+
+def _store_render(result, cached_path):
+    """
+    Move a finished scratch render into the cache directory.
+    
+    The scratch file is usually on tmpfs, so the move may be a copy; it goes
+    to a temp name first and is renamed into place once complete.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, part_path = tempfile.mkstemp(suffix='.part', dir=CACHE_DIR)
+    os.close(fd)
+    try:
+        shutil.move(result, part_path)
+        os.replace(part_path, cached_path)
+    except BaseException:
+        discard_outputs(part_path)
+        raise
+
+def _trim_cache(max_bytes=MAX_CACHE_BYTES):
+    """Remove the least recently used renders until the cache fits in max_bytes."""
+    entries = []
+    for path in glob.glob(os.path.join(CACHE_DIR, "overlay_*")):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    
+    total = 0
+    for _, size, path in sorted(entries, reverse=True):
+        total += size
+        if total > max_bytes:
+            discard_outputs(path)
+
+def _render_file(module_name, func_name, video_path, video_mtime, data_key, options, args):
+    """
+    Return the cached render's path, running the processor only if it is missing.
+    
+    The encoded video lives at a path derived from those inputs, so a rerun or
+    a restarted app finds the existing file and skips the processor entirely.
+    Renders go to a scratch path first and are moved into CACHE_DIR only on
+    success, so an interrupted render never leaves a truncated cache entry.
+    The cache is trimmed to MAX_CACHE_BYTES after each new render.
+    """
+    base = _cached_output_base(module_name, func_name, video_path, video_mtime, data_key, options)
+    cached_path = _find_cached_output(base)
+    
+    if cached_path is None:
+        module = importlib.import_module(module_name)
+        output_path = overlay_output_path()
+        # The writer may have swapped the extension; a failed render drops them all
+        scratch_base = os.path.splitext(output_path)[0]
+        scratch_paths = [output_path, *(scratch_base + ext for ext in VIDEO_FORMATS)]
+        try:
+            result = getattr(module, func_name)(video_path, *args, output_path, **dict(options))
+        except BaseException:
+            discard_outputs(*scratch_paths)
+            raise
+        if not result:
+            discard_outputs(*scratch_paths)
+            raise VideoRenderError(f"{func_name} failed for {video_path}")
+    
+        # Older renders of this video and variant belong to superseded inputs
+        discard_outputs(*glob.glob(_cached_output_prefix(module_name, func_name, video_path, options) + "*"))
+    
+        cached_path = base + os.path.splitext(result)[1].lower()
+        _store_render(result, cached_path)
+        discard_outputs(output_path)
+        _trim_cache()
+    
+    return cached_path
+
+def _open_render(*render_args):
+    """
+    Open the cached render for _render_file(*render_args) for reading.
+    
+    Another session's render of newer inputs may evict the file between
+    finding it and opening it; it is then rendered again rather than failing.
+    """
+    try:
+        return open(_render_file(*render_args), 'rb')
+    except FileNotFoundError:
+        return open(_render_file(*render_args), 'rb')
+
+def _render_video(module_name, func_name, video_path, video_mtime, data_key, options, _args):
+    """Render once per (processor, video version, data_key, options); _args is not hashed."""
+    with _open_render(module_name, func_name, video_path, video_mtime, data_key, options, _args) as f:
+        video_bytes = f.read()
+    
+    ext = os.path.splitext(f.name)[1]
+    return video_bytes, VIDEO_FORMATS.get(ext, 'video/mp4')
+
+# One in-page preview per analysis page; older versions fall out of memory
+@st.cache_resource(show_spinner=False, max_entries=5)
+def _shared_video(module_name, func_name, video_path, video_mtime, data_key, options, _args):
+    """
+    Hold one shared copy of each rendered video in memory.
+    
+    The cached file on disk survives restarts; this layer saves re-reading it
+    and returns the same immutable bytes object on each rerun.
+    """
+    return _render_video(module_name, func_name, video_path, video_mtime, data_key, options, _args)
+
+def cached_video(process_fn, video_path, data_key, *args, **options):
+    """
+    Return the encoded overlay video for process_fn, rendering only on a cache miss.
+    
+    Args:
+        process_fn: Overlay processor taking (video_path, *args, output_path, **options)
+        video_path: Input video path (its mtime is part of the cache key)
+        data_key: Hashable key identifying the analysis data, e.g. (json_path, mtime);
+            it must tell apart every input, since args are not hashed
+        *args: Data arguments passed through to process_fn
+        **options: Keyword options passed through to process_fn (part of the key)
+    
+    Returns:
+        tuple: (video_bytes, mime_format) for st.video, or None if rendering failed
+    """
+    try:
+        return _shared_video(
+            process_fn.__module__, process_fn.__name__,
+            video_path, os.path.getmtime(video_path), data_key,
+            tuple(sorted(options.items())), args
+        )
+    except VideoRenderError:
+        return None
+
+def deferred_video(process_fn, video_path, data_key, *args, **options):
+    """
+    Zero-argument callable for st.download_button data, rendering on click.
+    
+    Streamlit only calls it when the button is clicked, so a render that is
+    only offered as a download (e.g. full resolution) is never encoded
+    unless someone asks for it. It hands Streamlit a file object on the
+    cached render rather than bytes, so the download is not also pinned in
+    the in-memory cache_resource layer.
+    
+    Returns:
+        callable: Returns an open binary file, raising VideoRenderError on failure
+    """
+    def render():
+        return _open_render(
+            process_fn.__module__, process_fn.__name__,
+            video_path, os.path.getmtime(video_path), data_key,
+            tuple(sorted(options.items())), args
+        )
+    return render
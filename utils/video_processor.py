@@ -7,12 +7,20 @@ import numpy as np
 import subprocess
 import os
 import tempfile
-from utils.pose_drawing import draw_pose_on_frame
+import itertools
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from utils.pose_drawing import draw_pose_points, marker_stamp, blit_stamp
 
+@lru_cache(maxsize=None)
 def detect_available_codec():
     """
     Detect which video codec is available in the current environment.
     
+    Probed once per process; each probe writes and deletes a test clip.
+    
     Returns:
         tuple: (fourcc, extension, codec_name)
     """
@@ -55,6 +63,446 @@ def detect_available_codec():
     # If nothing works, return None
     return None, None, None
 
+# Set VIDEO_HW_DECODE=0 to force software decoding
+HW_DECODE_ENABLED = os.environ.get("VIDEO_HW_DECODE", "1") != "0"
+
+def open_video(video_path):
+    """
+    Open a video for decoding with the FFmpeg backend.
+    
+    Forcing CAP_FFMPEG skips OpenCV's backend probing and keeps decode
+    behaviour identical across platforms. When enabled, hardware decoding
+    (NVDEC/VAAPI/D3D11 - whatever the FFmpeg build supports) is requested;
+    OpenCV falls back to CPU decoding when no accelerator is available.
+    
+    Args:
+        video_path: Input video path
+    
+    Returns:
+        cv2.VideoCapture
+    """
+    if HW_DECODE_ENABLED:
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [
+            cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY
+        ])
+        if cap.isOpened():
+            return cap
+        cap.release()
+    
+    return cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+
+# Idle captures kept open between renders, keyed by (path, mtime)
+_capture_pool = {}
+_capture_pool_lock = threading.Lock()
+MAX_IDLE_CAPTURES = 8
+
+def acquire_capture(video_path):
+    """
+    Get a capture for video_path positioned at frame 0, reusing an idle one.
+    
+    Reopening the container (demuxer init, decoder open, first keyframe
+    parse) on every Streamlit rerun is avoided by rewinding a capture that
+    an earlier render handed back with release_capture().
+    
+    Args:
+        video_path: Input video path
+    
+    Returns:
+        cv2.VideoCapture
+    """
+    key = (video_path, os.path.getmtime(video_path))
+    with _capture_pool_lock:
+        idle = _capture_pool.get(key)
+        cap = idle.pop() if idle else None
+    
+    if cap is not None and cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+        return cap
+    if cap is not None:
+        cap.release()
+    return open_video(video_path)
+
+def release_capture(video_path, cap):
+    """Hand a capture from acquire_capture() back for reuse (or close it)."""
+    if not cap.isOpened():
+        return
+    
+    key = (video_path, os.path.getmtime(video_path))
+    with _capture_pool_lock:
+        # Drop captures of older versions of any file
+        for stale in [k for k in _capture_pool if k[0] == video_path and k != key]:
+            for old_cap in _capture_pool.pop(stale):
+                old_cap.release()
+        idle = _capture_pool.setdefault(key, [])
+        if len(idle) < MAX_IDLE_CAPTURES:
+            idle.append(cap)
+            return
+    cap.release()
+
+# Gaps longer than this are skipped with a container seek instead of grab()
+SEEK_GAP_FRAMES = 48
+
+def sampled_frames(cap, indices, size=None, out=None, position=0):
+    """
+    Yield only the requested frames from a capture.
+    
+    Short gaps are advanced with cap.grab(), and cap.retrieve() (colour
+    conversion and copy into a numpy array) only runs for the target indices.
+    Gaps longer than SEEK_GAP_FRAMES use CAP_PROP_POS_FRAMES, which seeks to
+    the preceding keyframe and decodes forward to the target only.
+    
+    Args:
+        cap: Opened cv2.VideoCapture
+        indices: Increasing iterable of frame indices to return
+        size: Optional (width, height) to resize retrieved frames to
+        out: Optional preallocated (N, H, W, 3) array; the i-th frame is
+            decoded into out[i] instead of a freshly allocated array
+        position: Frame index the capture is currently positioned at
+    
+    Yields:
+        tuple: (frame_idx, frame)
+    """
+    native = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    resize = size is not None and size != native
+    scratch = None
+    
+    frame_idx = position
+    for slot, target in enumerate(indices):
+        if target - frame_idx > SEEK_GAP_FRAMES and cap.set(cv2.CAP_PROP_POS_FRAMES, target):
+            frame_idx = target
+        
+        while frame_idx < target:
+            if not cap.grab():
+                return
+            frame_idx += 1
+        
+        if not cap.grab():
+            return
+        
+        if out is None:
+            ret, frame = cap.retrieve()
+            if ret and resize:
+                # INTER_AREA is several times slower at non-integer ratios
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+        elif not resize:
+            ret, frame = cap.retrieve(out[slot])
+        else:
+            # Full-size decode reuses one scratch buffer, resized into out
+            ret, scratch = cap.retrieve(scratch)
+            if ret:
+                frame = cv2.resize(scratch, size, dst=out[slot], interpolation=cv2.INTER_LINEAR)
+        if not ret:
+            return
+        
+        yield frame_idx, frame
+        frame_idx += 1
+
+def decode_frame_batch(cap, indices, size=None, position=0, out=None):
+    """
+    Decode a batch of frames into one (N, H, W, 3) array.
+    
+    Frames are decoded in place into the batch, so a batch costs at most a
+    single allocation instead of one per frame, and none when out is reused.
+    
+    Args:
+        cap: Opened cv2.VideoCapture
+        indices: Increasing sequence of frame indices to decode
+        size: Optional (width, height) to resize frames to
+        position: Frame index the capture is currently positioned at
+        out: Optional array from a previous call to decode into (must hold
+            at least len(indices) frames of this size)
+    
+    Returns:
+        numpy.ndarray: uint8 array of the frames decoded (fewer than
+        len(indices) if the video ended early)
+    """
+    if size is None:
+        size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    
+    batch = out if out is not None else np.empty((len(indices), size[1], size[0], 3), dtype=np.uint8)
+    count = sum(1 for _ in sampled_frames(cap, indices, size=size, out=batch, position=position))
+    return batch[:count]
+
+# Frames are decoded in batches of up to DECODE_CHUNK_FRAMES; with several
+# workers the batches are decoded concurrently, one capture per worker.
+# Batches are shortened for large frames so the decoded frames held at once
+# (every batch in flight plus the one being consumed) stay within
+# DECODE_BUFFER_BYTES - e.g. 8 frames per batch at 1080p with 4 workers.
+DECODE_WORKERS = min(4, os.cpu_count() or 1)
+DECODE_CHUNK_FRAMES = 48
+DECODE_BUFFER_BYTES = 256 << 20
+
+def _chunk_frames(size, batches):
+    """Frames per decode batch for (width, height) frames with `batches` held at once."""
+    frame_bytes = size[0] * size[1] * 3
+    return max(1, min(DECODE_CHUNK_FRAMES, DECODE_BUFFER_BYTES // (batches * frame_bytes)))
+
+class _WorkerCaptures:
+    """
+    One capture per decode thread, reused for every batch that thread decodes.
+    
+    A worker's batches always come later in the video than its previous
+    one, so its capture only ever moves forward.
+    """
+    
+    def __init__(self, video_path):
+        self.video_path = video_path
+        self.local = threading.local()
+        self.captures = []
+        self.lock = threading.Lock()
+    
+    def decode(self, indices, size):
+        cap = getattr(self.local, 'cap', None)
+        if cap is None:
+            cap = self.local.cap = acquire_capture(self.video_path)
+            self.local.position = 0
+            with self.lock:
+                self.captures.append(cap)
+        
+        batch = decode_frame_batch(cap, indices, size=size, position=self.local.position)
+        if len(batch) < len(indices):
+            # Position unknown after a short read; reopen for the next batch
+            self.local.cap = None
+        else:
+            self.local.position = indices[-1] + 1
+        return batch
+    
+    def release(self):
+        """Hand every worker's capture back once the workers have stopped."""
+        for cap in self.captures:
+            release_capture(self.video_path, cap)
+
+def iter_video_frames(video_path, cap, sample_stride=1, size=None, workers=None):
+    """
+    Yield every sample_stride-th frame of a video, in order.
+    
+    The frame range is split into batches (see _chunk_frames) that are
+    decoded with decode_frame_batch. With one worker the batches are read
+    in sequence from cap; with more, they are decoded concurrently, one
+    capture per worker thread (OpenCV releases the GIL while decoding), with
+    at most `workers` batches in flight to bound memory use. When the frame
+    count is unknown, frames are read one at a time from cap.
+    
+    Args:
+        video_path: Input video path
+        cap: Opened cv2.VideoCapture for video_path positioned at frame 0
+        sample_stride: Return every Nth source frame
+        size: Optional (width, height) to resize frames to
+        workers: Number of decode threads (defaults to DECODE_WORKERS)
+    
+    Yields:
+        numpy.ndarray: BGR frame (a view into its batch; copy it to keep it)
+    """
+    workers = DECODE_WORKERS if workers is None else workers
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    
+    if frame_count <= 0:
+        for _, frame in sampled_frames(cap, itertools.count(0, sample_stride), size=size):
+            yield frame
+        return
+    
+    if size is None:
+        size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    chunk_frames = _chunk_frames(size, workers + 1 if workers > 1 else 1)
+    
+    targets = range(0, frame_count, sample_stride)
+    chunks = [targets[i:i + chunk_frames] for i in range(0, len(targets), chunk_frames)]
+    
+    if workers <= 1:
+        # One buffer is reused for every batch, so a yielded frame is only
+        # valid until the next batch starts (the processors write it out first)
+        position = 0
+        batch = None
+        for chunk in chunks:
+            batch = decode_frame_batch(cap, chunk, size=size, position=position, out=batch)
+            yield from batch
+            if len(batch) < len(chunk):
+                return
+            position = chunk[-1] + 1
+        return
+    
+    worker_caps = _WorkerCaptures(video_path)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(worker_caps.decode, chunk, size))
+                if len(pending) >= workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    finally:
+        worker_caps.release()
+
+@lru_cache(maxsize=16)
+def probe_video(video_path, mtime):
+    """
+    Read basic stream properties, once per (path, mtime).
+    
+    Pages call this on every rerun; caching it avoids reopening the
+    container and initialising the decoder each time.
+    
+    Args:
+        video_path: Input video path
+        mtime: File modification time (cache key only)
+    
+    Returns:
+        dict: fps, width, height (0 if the video cannot be opened)
+    """
+    # Probing through the pool leaves the opened capture warm for the first render
+    cap = acquire_capture(video_path)
+    ok = cap.isOpened()
+    info = {
+        "fps": cap.get(cv2.CAP_PROP_FPS) if ok else 0,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) if ok else 0,
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) if ok else 0,
+    }
+    release_capture(video_path, cap)
+    return info
+
+def compute_sample_stride(video_path, metadata):
+    """
+    Compute the frame stride that aligns the source video with the analysis fps.
+    
+    Args:
+        video_path: Input video path
+        metadata: Video metadata (fps the analysis was run at)
+    
+    Returns:
+        int: Number of source frames per analysed frame (>= 1)
+    """
+    video_fps = probe_video(video_path, os.path.getmtime(video_path))["fps"]
+    
+    analysis_fps = metadata.get("fps", 0)
+    if not video_fps or not analysis_fps:
+        return 1
+    
+    return max(1, int(round(video_fps / analysis_fps)))
+
+# Tallest overlay rendered for the in-page player; full resolution is a download
+PREVIEW_MAX_HEIGHT = 480
+# Sources up to this multiple of PREVIEW_MAX_HEIGHT render at full size,
+# since a mild downscale costs more in resizing than it saves in encoding
+PREVIEW_MIN_REDUCTION = 1.5
+
+def compute_preview_scale(video_path, max_height=PREVIEW_MAX_HEIGHT):
+    """
+    Compute the render_scale that fits the in-page overlay preview within max_height.
+    
+    Args:
+        video_path: Input video path
+        max_height: Maximum preview height in pixels
+    
+    Returns:
+        float: Scale factor for the overlay processors (<= 1.0); 1.0 unless the
+        source is more than PREVIEW_MIN_REDUCTION times max_height
+    """
+    height = probe_video(video_path, os.path.getmtime(video_path))["height"]
+    if not height or height <= max_height * PREVIEW_MIN_REDUCTION:
+        return 1.0
+    
+    return max_height / height
+
+# ffmpeg encoder settings, fastest first: fixed-function hardware encoders
+# (NVIDIA NVENC, Intel Quick Sync, Apple VideoToolbox, AMD AMF), then x264
+# at its fastest preset. Quick Sync only takes NV12 input, which is the same
+# 4:2:0 sampling as yuv420p, so the stream stays browser-playable.
+FFMPEG_ENCODERS = [
+    ('h264_nvenc', ['-preset', 'p1', '-tune', 'll', '-rc', 'vbr', '-cq', '28']),
+    ('h264_qsv', ['-preset', 'veryfast', '-global_quality', '28', '-pix_fmt', 'nv12']),
+    ('h264_videotoolbox', ['-realtime', '1', '-b:v', '4M']),
+    ('h264_amf', ['-quality', 'speed', '-rc', 'cqp', '-qp_i', '28', '-qp_p', '28']),
+    ('libx264', ['-preset', 'ultrafast', '-tune', 'zerolatency', '-crf', '28']),
+]
+
+@lru_cache(maxsize=None)
+def detect_ffmpeg_encoder():
+    """
+    Detect the fastest working H.264 encoder in the ffmpeg binary.
+    
+    Each candidate encodes a one-frame test clip, since an encoder can be
+    compiled in (e.g. h264_nvenc) without the hardware to run it.
+    
+    Returns:
+        tuple: (encoder_name, encoder_args) or (None, None) if ffmpeg is unavailable
+    """
+    for name, args in FFMPEG_ENCODERS:
+        try:
+            result = subprocess.run([
+                'ffmpeg', '-hide_banner', '-loglevel', 'error',
+                '-f', 'lavfi', '-i', 'color=black:s=64x64:d=0.1',
+                '-frames:v', '1', '-pix_fmt', 'yuv420p', '-c:v', name, *args,
+                '-f', 'null', '-'
+            ], capture_output=True, timeout=15)
+        except FileNotFoundError:
+            # No ffmpeg binary at all
+            return None, None
+        except (subprocess.TimeoutExpired, OSError):
+            # e.g. a hardware encoder hanging on init; try the next candidate
+            continue
+        
+        if result.returncode == 0:
+            return name, args
+    
+    return None, None
+
+class FFmpegPipeWriter:
+    """
+    Minimal cv2.VideoWriter replacement that pipes raw BGR frames to ffmpeg.
+    
+    Produces fragmented H.264 MP4 (yuv420p) that browsers play directly.
+    The moov header is written up front and each one-second GOP is flushed
+    as its own fragment, so playback can start after the first fragment
+    arrives without the extra rewrite pass that +faststart needs.
+    """
+    
+    def __init__(self, output_path, width, height, fps, encoder, encoder_args):
+        gop = max(1, int(round(fps)))
+        # ffmpeg's errors go to a temp file rather than a pipe nobody drains
+        self.log = tempfile.TemporaryFile()
+        self.proc = subprocess.Popen([
+            'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-s', f'{width}x{height}', '-r', f'{fps}', '-i', '-',
+            # yuv420p needs even dimensions; encoder_args may override pix_fmt
+            '-an', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p',
+            '-c:v', encoder, *encoder_args, '-g', str(gop),
+            '-movflags', '+frag_keyframe+empty_moov+default_base_moof',
+            output_path
+        ], stdin=subprocess.PIPE, stderr=self.log)
+        self.broken = False
+    
+    def isOpened(self):
+        return self.proc.poll() is None
+    
+    def write(self, frame):
+        try:
+            self.proc.stdin.write(frame.tobytes())
+        except (BrokenPipeError, ValueError):
+            self.broken = True
+    
+    def release(self):
+        """Finish the encode; returns False if ffmpeg failed or stopped reading frames."""
+        if self.proc.stdin and not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                self.broken = True
+        ok = self.proc.wait() == 0 and not self.broken
+        if not ok:
+            self.log.seek(0)
+            print(f"ERROR: ffmpeg encode failed: {self.log.read().decode(errors='replace').strip()}")
+        self.log.close()
+        return ok
+
+def close_video_writer(out):
+    """
+    Release a writer from create_video_writer.
+    
+    Returns:
+        bool: False if the encode failed (cv2.VideoWriter gives no status)
+    """
+    return out.release() is not False
+
 def create_video_writer(output_path, width, height, fps):
     """
     Create video writer with automatic codec detection.
@@ -66,8 +514,18 @@ def create_video_writer(output_path, width, height, fps):
         fps: Frames per second
     
     Returns:
-        tuple: (cv2.VideoWriter, final_output_path) or (None, None) if failed
+        tuple: (writer, final_output_path) or (None, None) if failed - the writer
+        is an FFmpegPipeWriter when ffmpeg is available, else a cv2.VideoWriter
     """
+    # Prefer a fast H.264 encode through ffmpeg when the binary is available
+    encoder, encoder_args = detect_ffmpeg_encoder()
+    if encoder is not None:
+        final_output_path = output_path.rsplit('.', 1)[0] + '.mp4'
+        out = FFmpegPipeWriter(final_output_path, width, height, fps, encoder, encoder_args)
+        if out.isOpened():
+            print(f"Using codec: {encoder} with extension .mp4")
+            return out, final_output_path
+    
     # Detect available codec
     fourcc, ext, codec_name = detect_available_codec()
     
@@ -90,6 +548,40 @@ def create_video_writer(output_path, width, height, fps):
     
     return out, final_output_path
 
+# RAM-backed directory for overlay encodes in progress; falls back to the default temp dir
+TMPFS_DIR = "/dev/shm"
+
+def overlay_dir():
+    """Directory for scratch overlay encodes: tmpfs when writable, else the system temp dir."""
+    if os.path.isdir(TMPFS_DIR) and os.access(TMPFS_DIR, os.W_OK):
+        return TMPFS_DIR
+    return tempfile.gettempdir()
+
+def overlay_output_path(suffix='.webm'):
+    """
+    Reserve a temp path for a rendered overlay video, in RAM when possible.
+    
+    Writing to tmpfs keeps the encode in progress off disk; the overlay
+    cache moves the finished file to its on-disk cache directory.
+    
+    Args:
+        suffix: File extension (writers may swap it for the codec they use)
+    
+    Returns:
+        str: Path to an empty temp file
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=overlay_dir())
+    os.close(fd)
+    return path
+
+def discard_outputs(*paths):
+    """Remove temp video files, ignoring ones that are already gone."""
+    for path in set(filter(None, paths)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
 def convert_to_web_format(input_path, output_path=None):
     """
     Convert video to web-compatible format using ffmpeg if available.
@@ -141,8 +633,7 @@ def draw_com_on_frame(frame, com_x, frame_idx, stance_frame, impact_frame,
     # Draw COM dot at mid-height
     com_pixel_x = int(com_x * width)
     com_pixel_y = int(height * 0.5)
-    cv2.circle(frame, (com_pixel_x, com_pixel_y), 10, color, -1)
-    cv2.circle(frame, (com_pixel_x, com_pixel_y), 12, (255, 255, 255), 2)
+    blit_stamp(frame, marker_stamp(color, 10, 12), (com_pixel_x, com_pixel_y))
     
     # Draw trail
     if com_trail and len(com_trail) > 1:
@@ -160,35 +651,38 @@ def draw_com_on_frame(frame, com_x, frame_idx, stance_frame, impact_frame,
     
     return frame
 
-def process_video_with_com_overlay(video_path, pose_data, com_data, metadata, output_path):
+def process_video_with_com_overlay(video_path, pose, com_data, metadata, output_path,
+                                   sample_stride=1, render_scale=1.0):
     """
     Process video with pose annotations and COM overlay.
     Uses automatic codec detection for maximum compatibility.
     
     Args:
         video_path: Input video path
-        pose_data: List of pose data for each frame
+        pose: PoseSoA from load_pose_soa
         com_data: COM analysis data
         metadata: Video metadata
         output_path: Output video path
+        sample_stride: Decode every Nth source frame (see compute_sample_stride)
+        render_scale: Scale factor applied to frames before drawing and encoding
     
     Returns:
         Output video path or None if failed
     """
-    cap = cv2.VideoCapture(video_path)
+    cap = acquire_capture(video_path)
     if not cap.isOpened():
         print("ERROR: Cannot open input video")
         return None
     
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) * render_scale)
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) * render_scale)
+    fps = cap.get(cv2.CAP_PROP_FPS) / sample_stride
     
     # Create video writer with automatic codec detection
     out, final_output_path = create_video_writer(output_path, width, height, fps)
     
     if out is None:
-        cap.release()
+        release_capture(video_path, cap)
         print("ERROR: Cannot create video writer")
         return None
     
@@ -197,44 +691,44 @@ def process_video_with_com_overlay(video_path, pose_data, com_data, metadata, ou
     stance_frame = com_data.get("stance_frame", 0)
     impact_frame = com_data.get("impact_frame", 0)
     
-    # Create pose map for quick lookup
-    pose_map = {item['frame_idx']: item['landmarks'] for item in pose_data if item.get('landmarks')}
+    # Landmark pixel coordinates for every frame, converted in one pass;
+    # low-confidence poses are left undrawn
+    pose_px = pose.to_pixels(width, height)
+    has_pose = pose.confident_pose()
     
-    frame_idx = 0
-    com_trail = []
+    # Rolling trail; the deque drops the oldest point once it is full
     trail_length = 15
+    com_trail = deque(maxlen=trail_length)
     
-    print(f"Processing {len(pose_data)} frames...")
+    print(f"Processing {len(pose)} frames...")
     
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Draw pose if available
-        landmarks = pose_map.get(frame_idx)
-        if landmarks:
-            frame = draw_pose_on_frame(frame, landmarks, width, height)
-        
-        # Draw COM if available
-        if frame_idx < len(com_x_series):
-            com_x = com_x_series[frame_idx]
-            com_trail.append(com_x)
-            if len(com_trail) > trail_length:
-                com_trail.pop(0)
+    try:
+        # Analysis frame index counts sampled frames, not source frames
+        frames = iter_video_frames(video_path, cap, sample_stride, size=(width, height))
+        for frame_idx, frame in enumerate(frames):
+            # Draw pose if available
+            if frame_idx < len(has_pose) and has_pose[frame_idx]:
+                frame = draw_pose_points(frame, pose_px[frame_idx].tolist())
             
-            frame = draw_com_on_frame(frame, com_x, frame_idx, stance_frame, 
-                                     impact_frame, com_trail, width, height)
-        
-        out.write(frame)
-        frame_idx += 1
-        
-        # Progress indicator every 50 frames
-        if frame_idx % 50 == 0:
-            print(f"Processed {frame_idx} frames...")
-    
-    cap.release()
-    out.release()
+            # Draw COM if available
+            if frame_idx < len(com_x_series):
+                com_x = com_x_series[frame_idx]
+                com_trail.append(com_x)
+                
+                frame = draw_com_on_frame(frame, com_x, frame_idx, stance_frame, 
+                                         impact_frame, com_trail, width, height)
+            
+            out.write(frame)
+            
+            # Progress indicator every 50 frames
+            if (frame_idx + 1) % 50 == 0:
+                print(f"Processed {frame_idx + 1} frames...")
+    finally:
+        release_capture(video_path, cap)
+        encoded = close_video_writer(out)
+    
+    if not encoded:
+        return None
     
     print(f"Video saved to: {final_output_path}")
     
@@ -6,6 +6,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
 from plotly.subplots import make_subplots
+from visualizations.overview import combine_figures
 
 def plot_com_trajectory(com_data, metadata):
     """
@@ -88,12 +89,12 @@ def plot_com_trajectory(com_data, metadata):
     
     return fig
 
-def plot_movement_scores(pose_data, com_data):
+def plot_movement_scores(pose, com_data):
     """
     Plot hip movement scores showing acceleration/deceleration.
     
     Args:
-        pose_data: List of pose data dicts
+        pose: PoseSoA from load_pose_soa (float32)
         com_data: COM analysis data dict
     
     Returns:
@@ -102,28 +103,13 @@ def plot_movement_scores(pose_data, com_data):
     stance_frame = com_data.get("stance_frame", 0)
     impact_frame = com_data.get("impact_frame", 0)
     
-    # Calculate movement scores
-    movement_scores = [0.0]
-    for i in range(1, len(pose_data)):
-        curr = pose_data[i]
-        prev = pose_data[i-1]
-        
-        if not curr.get('landmarks') or not prev.get('landmarks'):
-            movement_scores.append(0.0)
-            continue
-        
-        curr_lm = curr['landmarks']
-        prev_lm = prev['landmarks']
-        
-        # Hip movement (indices 23, 24)
-        if len(curr_lm) > 24 and len(prev_lm) > 24:
-            diff = (abs(curr_lm[23]['x'] - prev_lm[23]['x']) + 
-                   abs(curr_lm[24]['x'] - prev_lm[24]['x']))
-            movement_scores.append(diff)
-        else:
-            movement_scores.append(0.0)
-    
-    frames = list(range(len(movement_scores)))
+    # Calculate movement scores: hip x change (indices 23, 24) between
+    # consecutive frames, 0 where either frame has no pose
+    movement_scores = np.zeros(max(len(pose), 1))
+    hip_x = pose.xs[:, [23, 24]].astype(np.float64)
+    movement_scores[1:] = np.nan_to_num(np.abs(np.diff(hip_x, axis=0)).sum(axis=1))
+    
+    frames = np.arange(len(movement_scores))
     
     fig = go.Figure()
     
@@ -166,12 +152,12 @@ def plot_movement_scores(pose_data, com_data):
     
     return fig
 
-def plot_com_components(pose_data, com_data):
+def plot_com_components(pose, com_data):
     """
     Plot COM components breakdown (hip vs shoulder contribution).
     
     Args:
-        pose_data: List of pose data dicts
+        pose: PoseSoA from load_pose_soa (float32)
         com_data: COM analysis data dict
     
     Returns:
@@ -179,24 +165,11 @@ def plot_com_components(pose_data, com_data):
     """
     com_x_series = com_data.get("com_x_series", [])
     
-    # Calculate hip and shoulder midpoints
-    hip_mid = []
-    shoulder_mid = []
-    
-    for frame in pose_data:
-        if frame.get('landmarks'):
-            lm = frame['landmarks']
-            if len(lm) > 24:
-                # Hip midpoint (indices 23, 24)
-                hip_mid.append((lm[23]['x'] + lm[24]['x']) / 2)
-                # Shoulder midpoint (indices 11, 12)
-                shoulder_mid.append((lm[11]['x'] + lm[12]['x']) / 2)
-            else:
-                hip_mid.append(None)
-                shoulder_mid.append(None)
-        else:
-            hip_mid.append(None)
-            shoulder_mid.append(None)
+    # Calculate hip (indices 23, 24) and shoulder (indices 11, 12) midpoints;
+    # frames without a pose stay NaN and show as gaps
+    xs = pose.xs.astype(np.float64)
+    hip_mid = (xs[:, 23] + xs[:, 24]) / 2
+    shoulder_mid = (xs[:, 11] + xs[:, 12]) / 2
     
     frames = list(range(len(com_x_series)))
     
@@ -311,3 +284,25 @@ def create_heatmap(com_data, metadata):
     )
     
     return fig
+
+def plot_com_overview(pose, com_data, metadata):
+    """
+    Plot trajectory, movement scores, components and heatmap as one 2x2 grid.
+    
+    Args:
+        pose: PoseSoA from load_pose_soa (float32)
+        com_data: COM analysis data dict
+        metadata: Video metadata dict
+    
+    Returns:
+        Plotly figure
+    """
+    figures = [
+        plot_com_trajectory(com_data, metadata),
+        plot_movement_scores(pose, com_data),
+        plot_com_components(pose, com_data),
+        create_heatmap(com_data, metadata)
+    ]
+    titles = ["COM Trajectory", "Hip Movement Scores", "COM Components", "COM Density"]
+    
+    return combine_figures(figures, titles, "COM Analysis Overview")
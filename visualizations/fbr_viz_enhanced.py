@@ -5,6 +5,8 @@ Additional advanced analysis functions for foot plant biomechanics.
 import plotly.graph_objects as go
 import numpy as np
 from plotly.subplots import make_subplots
+from visualizations.fbr_viz import plot_com_vertical_movement, plot_deceleration_profile
+from visualizations.overview import combine_figures
 
 def plot_braking_efficiency_zones(fbr_data, metadata):
     """
@@ -353,3 +355,24 @@ def plot_impact_force_estimate(fbr_data, metadata):
     )
     
     return fig
+
+def plot_fbr_overview(fbr_data, metadata):
+    """
+    Plot COM vertical, deceleration, velocity and energy charts as one 2x2 grid.
+    
+    Args:
+        fbr_data: FBR analysis data dict
+        metadata: Video metadata dict
+    
+    Returns:
+        Plotly figure
+    """
+    figures = [
+        plot_com_vertical_movement(fbr_data, metadata),
+        plot_deceleration_profile(fbr_data, metadata),
+        plot_velocity_profile(fbr_data, metadata),
+        plot_energy_absorption(fbr_data, metadata)
+    ]
+    titles = ["COM Vertical", "Deceleration", "Vertical Velocity", "Energy Absorption"]
+    
+    return combine_figures(figures, titles, "FBR Overview")
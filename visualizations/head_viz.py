@@ -308,7 +308,7 @@ def draw_head_on_frame(frame, head_x, head_y, frame_idx, stance_frame, impact_fr
         frame_idx: Current frame index
         stance_frame: Stance frame index
         impact_frame: Impact frame index
-        head_trail: List of recent head positions for trail
+        head_trail: Sequence of recent head positions for trail
         width: Frame width
         height: Frame height
         heatmap_overlay: Optional heatmap image to overlay
@@ -331,13 +331,9 @@ def draw_head_on_frame(frame, head_x, head_y, frame_idx, stance_frame, impact_fr
     head_pixel_x = int(head_x * width)
     head_pixel_y = int(head_y * height)
     
-    # Draw crosshair
-    cv2.line(frame, (head_pixel_x - 15, head_pixel_y), (head_pixel_x + 15, head_pixel_y), color, 2)
-    cv2.line(frame, (head_pixel_x, head_pixel_y - 15), (head_pixel_x, head_pixel_y + 15), color, 2)
-    
-    # Draw circle
-    cv2.circle(frame, (head_pixel_x, head_pixel_y), 8, color, -1)
-    cv2.circle(frame, (head_pixel_x, head_pixel_y), 10, (255, 255, 255), 2)
+    # Draw crosshair and circle from a pre-rendered stamp
+    from utils.pose_drawing import marker_stamp, blit_stamp
+    blit_stamp(frame, marker_stamp(color, 8, 10, crosshair=15), (head_pixel_x, head_pixel_y))
     
     # Draw trail
     if head_trail and len(head_trail) > 1:
@@ -4,6 +4,8 @@ Additional advanced analysis functions.
 """
 import plotly.graph_objects as go
 import numpy as np
+from visualizations.head_viz import plot_head_trajectory_2d, plot_head_displacement, create_head_heatmap
+from visualizations.overview import combine_figures
 
 def plot_stability_zones(head_data):
     """
@@ -312,3 +314,24 @@ def plot_benchmark_comparison(head_data):
     )
     
     return fig
+
+def plot_head_overview(head_data, metadata):
+    """
+    Plot trajectory, displacement, heatmap and rolling stability as one 2x2 grid.
+    
+    Args:
+        head_data: Head stability data dict
+        metadata: Video metadata dict
+    
+    Returns:
+        Plotly figure
+    """
+    figures = [
+        plot_head_trajectory_2d(head_data),
+        plot_head_displacement(head_data, metadata),
+        create_head_heatmap(head_data),
+        plot_rolling_stability(head_data, metadata)
+    ]
+    titles = ["2D Trajectory", "Displacement", "Position Density", "Rolling Stability"]
+    
+    return combine_figures(figures, titles, "Head Stability Overview")
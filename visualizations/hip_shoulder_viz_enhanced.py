@@ -36,11 +36,15 @@ def plot_separation_zones(hs_data, metadata):
     frames = list(range(len(angle_series)))
     time_sec = [f / fps for f in frames]
     
-    # Calculate zone percentages
-    elite_pct = sum(1 for a in angle_series if a >= 45) / len(angle_series) * 100
-    good_pct = sum(1 for a in angle_series if 35 <= a < 45) / len(angle_series) * 100
-    developing_pct = sum(1 for a in angle_series if 25 <= a < 35) / len(angle_series) * 100
-    poor_pct = sum(1 for a in angle_series if a < 25) / len(angle_series) * 100
+    # Calculate zone percentages over the whole series at once
+    angles = np.asarray(angle_series, dtype=float)
+    elite = angles >= 45
+    good = (angles >= 35) & ~elite
+    developing = (angles >= 25) & (angles < 35)
+    elite_pct = elite.mean() * 100
+    good_pct = good.mean() * 100
+    developing_pct = developing.mean() * 100
+    poor_pct = (angles < 25).mean() * 100
     
     fig = go.Figure()
     
@@ -59,8 +63,7 @@ def plot_separation_zones(hs_data, metadata):
                   annotation_text="Poor Zone", annotation_position="right")
     
     # Color code the line based on zones
-    colors = ['green' if a >= 45 else 'lightblue' if a >= 35 else 'yellow' if a >= 25 else 'red' 
-              for a in angle_series]
+    colors = np.select([elite, good, developing], ['green', 'lightblue', 'yellow'], 'red').tolist()
     
     # Plot as scatter with color coding
     fig.add_trace(go.Scatter(
@@ -230,11 +233,12 @@ def plot_hip_vs_shoulder_rotation(hs_data, metadata):
     # For now, we'll estimate based on separation angle
     # Assume hips rotate more, shoulders lag
     base_rotation = 45  # Base rotation angle
-    hip_rotation = [base_rotation + a * 0.6 for a in angle_series]
-    shoulder_rotation = [base_rotation + a * 0.4 for a in angle_series]
+    angles = np.asarray(angle_series, dtype=float)
+    hip_rotation = base_rotation + angles * 0.6
+    shoulder_rotation = base_rotation + angles * 0.4
     
-    frames = list(range(len(angle_series)))
-    time_sec = [f / fps for f in frames]
+    frames = np.arange(len(angles))
+    time_sec = frames / fps
     
     fig = go.Figure()
     
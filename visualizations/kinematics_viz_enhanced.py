@@ -90,9 +90,9 @@ def plot_energy_transfer_efficiency(kin_data):
     shoulder_vel = velocities.get("shoulder", [])
     
     # Calculate energy (proportional to velocity squared)
-    hip_energy = sum([v**2 for v in hip_vel]) if hip_vel else 0
-    torso_energy = sum([v**2 for v in torso_vel]) if torso_vel else 0
-    shoulder_energy = sum([v**2 for v in shoulder_vel]) if shoulder_vel else 0
+    hip_energy, torso_energy, shoulder_energy = (
+        float(np.dot(v, v)) for v in (np.asarray(vel, dtype=float) for vel in (hip_vel, torso_vel, shoulder_vel))
+    )
     
     # Normalize
     total = hip_energy + torso_energy + shoulder_energy
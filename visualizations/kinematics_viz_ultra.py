@@ -41,13 +41,16 @@ def plot_3d_rotation_animation(kin_data, metadata):
     
     # Normalize velocities for 3D coordinates
     max_vel = max(max(hip_vel), max(torso_vel), max(shoulder_vel))
+    hip_norm, torso_norm, shoulder_norm = (
+        np.asarray(vel, dtype=float) / max_vel for vel in (hip_vel, torso_vel, shoulder_vel)
+    )
     
     fig = go.Figure()
     
     # Add 3D scatter for each segment
     fig.add_trace(go.Scatter3d(
         x=time_points,
-        y=[v/max_vel for v in hip_vel],
+        y=hip_norm,
         z=[0]*len(hip_vel),
         mode='lines+markers',
         name='Hip',
@@ -57,7 +60,7 @@ def plot_3d_rotation_animation(kin_data, metadata):
     
     fig.add_trace(go.Scatter3d(
         x=time_points,
-        y=[v/max_vel for v in torso_vel],
+        y=torso_norm,
         z=[1]*len(torso_vel),
         mode='lines+markers',
         name='Torso',
@@ -67,7 +70,7 @@ def plot_3d_rotation_animation(kin_data, metadata):
     
     fig.add_trace(go.Scatter3d(
         x=time_points,
-        y=[v/max_vel for v in shoulder_vel],
+        y=shoulder_norm,
         z=[2]*len(shoulder_vel),
         mode='lines+markers',
         name='Shoulder',
@@ -187,9 +190,9 @@ def plot_power_flow_diagram(kin_data, metadata):
     shoulder_vel = velocities.get("shoulder", [])
     
     # Calculate total energy (proportional to velocity squared integrated over time)
-    hip_energy = sum([v**2 for v in hip_vel]) if hip_vel else 0
-    torso_energy = sum([v**2 for v in torso_vel]) if torso_vel else 0
-    shoulder_energy = sum([v**2 for v in shoulder_vel]) if shoulder_vel else 0
+    hip_energy, torso_energy, shoulder_energy = (
+        float(np.dot(v, v)) for v in (np.asarray(vel, dtype=float) for vel in (hip_vel, torso_vel, shoulder_vel))
+    )
     
     # Estimate transfers (simplified model)
     hip_to_torso = min(hip_energy, torso_energy) * 0.8
@@ -0,0 +1,72 @@
+"""
+Overview grid helpers.
+Combines several single-axis figures into one subplot figure so a page can
+ship a group of related charts as a single Plotly render.
+"""
+import math
+from plotly.subplots import make_subplots
+
+def _remap_ref(ref, axis_suffix):
+    """Point an 'x'/'y'/'x domain'/'y domain' reference at subplot axis_suffix."""
+    if not ref or ref == "paper":
+        return None
+    axis, _, domain = ref.partition(" ")
+    if axis not in ("x", "y"):
+        return None
+    return f"{axis}{axis_suffix}" + (f" {domain}" if domain else "")
+
+def combine_figures(figures, titles, title, cols=2, row_height=400):
+    """
+    Combine single-axis figures into one subplot grid.
+
+    Traces, axis titles and axis-anchored shapes/annotations (e.g. stance and
+    impact markers) are copied into the grid. Source figures are not modified.
+
+    Args:
+        figures: List of Plotly figures with a single x/y axis pair
+        titles: Subplot titles, one per figure
+        title: Overall figure title
+        cols: Number of grid columns
+        row_height: Height in pixels of each grid row
+
+    Returns:
+        Plotly figure
+    """
+    rows = math.ceil(len(figures) / cols)
+    combined = make_subplots(rows=rows, cols=cols, subplot_titles=titles,
+                             vertical_spacing=0.12, horizontal_spacing=0.08)
+
+    for i, fig in enumerate(figures):
+        row, col = i // cols + 1, i % cols + 1
+        axis_suffix = "" if i == 0 else str(i + 1)
+
+        combined.add_traces(list(fig.data), rows=row, cols=col)
+
+        combined.update_xaxes(title_text=fig.layout.xaxis.title.text, row=row, col=col)
+        combined.update_yaxes(title_text=fig.layout.yaxis.title.text,
+                              autorange=fig.layout.yaxis.autorange, row=row, col=col)
+
+        for shape in fig.layout.shapes:
+            xref = _remap_ref(shape.xref, axis_suffix)
+            yref = _remap_ref(shape.yref, axis_suffix)
+            if xref and yref:
+                combined.add_shape(shape.to_plotly_json(), xref=xref, yref=yref)
+
+        for annotation in fig.layout.annotations:
+            xref = _remap_ref(annotation.xref, axis_suffix)
+            yref = _remap_ref(annotation.yref, axis_suffix)
+            if xref and yref:
+                combined.add_annotation(annotation.to_plotly_json(), xref=xref, yref=yref)
+
+    # Per-chart legends and colorbars overlap in a grid; subplot titles label the charts
+    combined.update_traces(showlegend=False)
+    combined.update_traces(marker_showscale=False, selector=dict(type="bar"))
+    combined.update_traces(showscale=False, selector=dict(type="heatmap"))
+
+    combined.update_layout(
+        title=title,
+        height=rows * row_height,
+        hovermode='closest'
+    )
+
+    return combined